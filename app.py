@@ -1,44 +1,43 @@
-import fastf1
+from html import escape
+
+import numpy as np
 import streamlit as st
 import pandas as pd
-import joblib
-import plotly.graph_objects as go
-from sklearn.preprocessing import LabelEncoder
+
+from f1_predictor import metrics
+from f1_predictor.cache import prediction_cache
+from f1_predictor.ingest import qualifying_order
+from f1_predictor.registry import get_bundle, read_registry
+from f1_predictor.render import position_chart, results_board_html
+from f1_predictor.schedule import get_schedule
+from f1_predictor.season import average_quali_grid
+from f1_predictor.service import grid_positions, predict_race
+from f1_predictor.simulation import simulate_race
+
+# Prometheus text metrics on localhost (F1_METRICS_PORT), started once per process
+metrics.start_http_server()
 
 # ===== LOAD MODELS & DATA =====
-stack_model = joblib.load("model/f1_race_predictor_model.pkl")
-scaler = joblib.load("model/scaler.pkl")
-feature_columns = joblib.load("model/feature_columns.pkl")
-filtered_drivers_info = pd.read_csv("model/DATA/filtered_drivers_info.csv")
+# The selected registry entry lives in session state; bundles are loaded once
+# per server process (bounded LRU) and shared across sessions/reruns
+registry = read_registry()
+if st.session_state.get("model_id") not in registry.entries:
+    st.session_state.model_id = registry.default
+entry, bundle = get_bundle(st.session_state.model_id)
 
 # Driver list
-driver_abbrs = filtered_drivers_info["Abbreviation"].tolist()
-driver_full_names = dict(zip(filtered_drivers_info["Abbreviation"], filtered_drivers_info["DriverName"]))
+driver_abbrs = bundle.driver_abbrs
+driver_full_names = bundle.driver_names
 
-# Team colors (F1 official 2024)
-TEAM_COLORS = {
-    "VER": "#3671C6", "PER": "#3671C6",  # Red Bull
-    "HAM": "#27F4D2", "RUS": "#27F4D2",  # Mercedes
-    "LEC": "#E8002D", "SAI": "#E8002D",  # Ferrari
-    "NOR": "#FF8000", "PIA": "#FF8000",  # McLaren
-    "ALO": "#229971", "STR": "#229971",  # Aston Martin
-    "GAS": "#5E8FAA", "OCO": "#5E8FAA",  # Alpine
-    "BOT": "#52E252", "ZHO": "#52E252",  # Kick Sauber
-    "TSU": "#6692FF", "RIC": "#6692FF",  # VCARB
-    "ALB": "#64C4FF", "SAR": "#64C4FF",  # Williams
-    "MAG": "#B6BABD", "HUL": "#B6BABD",  # Haas
-}
+# Team colors shipped with the model (model/<path>/team_colors.json)
+TEAM_COLORS = bundle.team_colors
 
-# Get 2024 schedule
-schedule = fastf1.get_event_schedule(2024)
-schedule = schedule.drop(0)
-event_names = schedule['EventName'].tolist()
-event_rounds = schedule['RoundNumber'].tolist()
-race_name_to_round = dict(zip(event_names, event_rounds))
+# Number of races sampled in simulation mode
+SIMULATION_RUNS = 10_000
 
 # ===== PAGE CONFIG =====
 st.set_page_config(
-    page_title="F1 Race Predictor 2024",
+    page_title=entry.title,
     page_icon="🏎️",
     layout="wide",
     initial_sidebar_state="collapsed"
@@ -228,15 +227,6 @@ st.markdown("""
         font-weight: 700;
     }
     
-    /* Grid Position Input */
-    .grid-input-section {
-        background: rgba(255,255,255,0.03);
-        border-radius: 10px;
-        padding: 2rem;
-        margin: 2rem 0;
-        border: 1px solid rgba(255,255,255,0.1);
-    }
-    
     /* Confidence Indicator */
     .confidence-bar {
         width: 100%;
@@ -256,13 +246,48 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ===== HEADER =====
-st.markdown("""
+st.markdown(f"""
     <div class="main-header">
-        <h1 class="main-title">🏎️ F1 Race Predictor</h1>
+        <h1 class="main-title">🏎️ {escape(entry.title)}</h1>
         <p class="subtitle">Predict race finishing positions using advanced machine learning</p>
     </div>
 """, unsafe_allow_html=True)
 
+# ===== MODEL SELECTION =====
+def select_season():
+    st.session_state.model_id = registry.for_season(st.session_state.season_picker)[0].id
+    # The model list changes with the season; let the picker start from the new model
+    st.session_state.pop("model_picker", None)
+
+
+def select_model():
+    st.session_state.model_id = st.session_state.model_picker
+
+
+seasons = registry.seasons()
+season_models = [item.id for item in registry.for_season(entry.season)]
+model_cols = st.columns(2)
+with model_cols[0]:
+    st.selectbox("Season", seasons, index=seasons.index(entry.season), key="season_picker", on_change=select_season)
+with model_cols[1]:
+    st.selectbox(
+        "Model",
+        season_models,
+        index=season_models.index(entry.id),
+        format_func=lambda model_id: registry.entries[model_id].label,
+        key="model_picker",
+        on_change=select_model,
+    )
+
+# Season schedule of the selected model (local snapshot, no network access)
+try:
+    schedule = get_schedule(entry.season)
+except FileNotFoundError as exc:
+    st.error(f"⚠️ {exc}")
+    st.stop()
+event_names = schedule.event_names
+race_name_to_round = schedule.race_name_to_round
+
 # ===== RACE SELECTION =====
 st.markdown('<div class="section-header">📍 Race Selection</div>', unsafe_allow_html=True)
 
@@ -271,273 +296,145 @@ round_number = race_name_to_round[selected_race_name]
 
 # ===== GRID POSITIONS INPUT =====
 st.markdown('<div class="section-header">🏁 Grid Positions</div>', unsafe_allow_html=True)
-st.markdown('<div class="grid-input-section">', unsafe_allow_html=True)
 
-grid_positions = {}
-chosen_drivers = set()
+driver_labels = {abbr: f"{abbr} - {driver_full_names[abbr]}" for abbr in driver_abbrs}
+label_to_abbr = {label: abbr for abbr, label in driver_labels.items()}
+average_quali_order = [driver_abbrs[i] for i in np.argsort(average_quali_grid(bundle), kind="stable")]
+
+
+@st.cache_data(show_spinner="📡 Loading qualifying from FastF1...")
+def fastf1_qualifying_order(season, round_number):
+    return qualifying_order(season, round_number)
 
-# Create 5 columns for 4 drivers each (20 total)
-for row in range(5):
-    cols = st.columns(4)
-    for col_idx in range(4):
-        pos = row * 4 + col_idx + 1
-        if pos <= 20:
-            with cols[col_idx]:
-                available = [d for d in driver_abbrs if d not in chosen_drivers]
-                driver = st.selectbox(
-                    f"P{pos}",
-                    options=[""] + available,
-                    key=f"grid_pos_{pos}",
-                    format_func=lambda x: f"{x} - {driver_full_names.get(x, '')}" if x else "Select Driver"
-                )
-                if driver:
-                    grid_positions[pos] = driver
-                    chosen_drivers.add(driver)
 
-st.markdown('</div>', unsafe_allow_html=True)
+def set_grid(order):
+    """Replace the editor contents; a new editor key drops the old edits."""
+    drivers = [driver_labels[abbr] for abbr in order] + [None] * (len(driver_abbrs) - len(order))
+    st.session_state.grid_table = pd.DataFrame({"Position": range(1, len(driver_abbrs) + 1), "Driver": drivers})
+    st.session_state.grid_editor = st.session_state.get("grid_editor", 0) + 1
+    st.session_state.grid_model = entry.id
 
-# ===== PREDICTION BUTTON =====
-col1, col2, col3 = st.columns([2, 1, 2])
-with col2:
-    predict_button = st.button("🏆 PREDICT RACE", use_container_width=True)
+
+# Another model may have a different driver table: start from an empty grid
+if st.session_state.get("grid_model") != entry.id:
+    set_grid([])
+
+preset_cols = st.columns(3)
+with preset_cols[0]:
+    if st.button("📊 Pre-fill from average qualifying", use_container_width=True):
+        set_grid(average_quali_order)
+with preset_cols[1]:
+    if st.button("⏱️ Pre-fill from FastF1 qualifying", use_container_width=True):
+        try:
+            quali_order = [abbr for abbr in fastf1_qualifying_order(schedule.season, round_number) if abbr in driver_labels]
+        except Exception as exc:
+            st.warning(f"⚠️ Qualifying for {selected_race_name} is not available: {exc}")
+        else:
+            # Drivers missing from that session fill the back of the grid by average qualifying
+            set_grid(quali_order + [abbr for abbr in average_quali_order if abbr not in quali_order])
+with preset_cols[2]:
+    if st.button("🧹 Clear grid", use_container_width=True):
+        set_grid([])
+
+# One form: edits stay in the browser until the grid is submitted
+with st.form("grid_form", border=False):
+    grid_table = st.data_editor(
+        st.session_state.grid_table,
+        key=f"grid_editor_{st.session_state.grid_editor}",
+        hide_index=True,
+        use_container_width=True,
+        height=36 * (len(driver_abbrs) + 1) + 3,
+        column_config={
+            "Position": st.column_config.NumberColumn("Grid", format="P%d", disabled=True),
+            "Driver": st.column_config.SelectboxColumn("Driver", options=list(driver_labels.values())),
+        },
+    )
+    
+    # ===== PREDICTION BUTTON =====
+    col1, col2, col3 = st.columns([2, 1, 2])
+    with col2:
+        predict_button = st.form_submit_button("🏆 PREDICT RACE", use_container_width=True)
+        run_simulation = st.checkbox(
+            "🎲 Monte Carlo simulation",
+            help=f"Also simulate {SIMULATION_RUNS:,} races with grid shuffles, retirements and model noise",
+        )
 
 # ===== PREDICTION LOGIC =====
 if predict_button:
-    driver_to_grid = {driver: pos for pos, driver in grid_positions.items() if driver}
+    ordered_grid = [label_to_abbr.get(label) for label in grid_table["Driver"]]
     
-    if len(driver_to_grid) < 20:
+    if None in ordered_grid:
+        metrics.inc("prediction_errors_total")
         st.error("⚠️ Please select all 20 drivers before prediction!")
+    elif len(set(ordered_grid)) < len(ordered_grid):
+        metrics.inc("prediction_errors_total")
+        st.error("⚠️ Each driver can only start from one grid slot!")
     else:
-        with st.spinner("🔄 Analyzing race data and predicting results..."):
-            # Prepare data with enhanced features
-            GridPosition = [driver_to_grid.get(driver, 20) for driver in driver_abbrs]
-            
-            # Enhanced feature engineering
-            driver_info = filtered_drivers_info.set_index("Abbreviation")
-            
-            pred_data = []
-            for i, driver in enumerate(driver_abbrs):
-                grid_pos = GridPosition[i]
-                driver_stats = driver_info.loc[driver]
-                
-                # Calculate advanced features
-                quali_score = (driver_stats["AvgQualiPosition"] + grid_pos) / 2
-                grid_improvement = driver_stats["AvgRacePosition"] - grid_pos
-                consistency_score = abs(driver_stats["AvgQualiPosition"] - driver_stats["AvgRacePosition"])
-                
-                pred_data.append({
-                    "Round": round_number,
-                    "Abbreviation": driver,
-                    "GridPosition": grid_pos,
-                    "Points": driver_stats["Points"],
-                    "AvgQualiPosition": driver_stats["AvgQualiPosition"],
-                    "AvgRacePosition": driver_stats["AvgRacePosition"],
-                    "QualifyingScore": quali_score,
-                })
-            
-            pred_gp_data = pd.DataFrame(pred_data)
-            
-            # Encode drivers
-            label_enc_driver = LabelEncoder()
-            pred_gp_data["Abbreviation_Encoded"] = label_enc_driver.fit_transform(pred_gp_data["Abbreviation"])
-            
-            # Prepare features for prediction
-            feature_data = pred_gp_data.copy()
-            feature_data["Abbreviation"] = feature_data["Abbreviation_Encoded"]
-            feature_data = feature_data[feature_columns]
-            
-            # Scale and predict
-            X_scaled = scaler.transform(feature_data)
-            predicted_positions = stack_model.predict(X_scaled)
-            
-            # Create results dataframe
-            pred_gp_data["PredictedPosition"] = predicted_positions
-            pred_gp_data["Confidence"] = 100 - (abs(predicted_positions - pred_gp_data["GridPosition"]) * 3)
-            pred_gp_data["Confidence"] = pred_gp_data["Confidence"].clip(50, 100)
-            
-            results = pred_gp_data.sort_values("PredictedPosition").reset_index(drop=True)
-            results.index += 1
-            
-            # Calculate points based on F1 point system
-            points_system = {1: 25, 2: 18, 3: 15, 4: 12, 5: 10, 6: 8, 7: 6, 8: 4, 9: 2, 10: 1}
-            results["PredictedPoints"] = results.index.map(lambda x: points_system.get(x, 0))
-            
-            # ===== DISPLAY RESULTS =====
-            st.markdown('<div class="section-header">🏆 Predicted Race Results</div>', unsafe_allow_html=True)
-            
-            # Top 3 Podium Highlight
-            st.markdown("### 🥇 Podium")
-            podium_cols = st.columns(3)
-            
-            for idx, (_, row) in enumerate(results.head(3).iterrows()):
-                with podium_cols[idx]:
-                    position_emoji = ["🥇", "🥈", "🥉"][idx]
-                    driver_abbr = row["Abbreviation"]
-                    driver_name = driver_full_names[driver_abbr]
-                    team_color = TEAM_COLORS.get(driver_abbr, "#FFFFFF")
-                    
-                    st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, {team_color}40 0%, {team_color}20 100%);
-                                    border: 2px solid {team_color};
-                                    border-radius: 10px;
-                                    padding: 1.5rem;
-                                    text-align: center;">
-                            <div style="font-size: 3rem;">{position_emoji}</div>
-                            <div style="font-size: 1.5rem; font-weight: 700; color: white; margin-top: 0.5rem;">
-                                {driver_name}
-                            </div>
-                            <div style="font-size: 1rem; color: rgba(255,255,255,0.7); margin-top: 0.3rem;">
-                                {driver_abbr}
-                            </div>
-                            <div style="font-size: 1.2rem; color: {team_color}; font-weight: 700; margin-top: 0.8rem;">
-                                {int(row['PredictedPoints'])} PTS
-                            </div>
-                        </div>
-                    """, unsafe_allow_html=True)
-            
-            st.markdown("---")
-            
-            # Full Results Table
-            st.markdown('<div class="results-table">', unsafe_allow_html=True)
-            
-            for idx, (_, row) in enumerate(results.iterrows(), 1):
-                driver_abbr = row["Abbreviation"]
-                driver_name = driver_full_names[driver_abbr]
-                team_color = TEAM_COLORS.get(driver_abbr, "#FFFFFF")
-                grid_pos = int(row["GridPosition"])
-                pts = int(row["PredictedPoints"])
-                confidence = int(row["Confidence"])
+        # ?profile=1 dumps a cProfile of this run when the server has F1_PROFILING=1
+        with metrics.profile("predict", requested=st.query_params.get("profile") == "1"):
+            with st.spinner("🔄 Analyzing race data and predicting results..."):
+                # Grid positions in driver-table order
+                grid = grid_positions(bundle, ordered_grid)
                 
-                position_class = f"position-{idx}" if idx <= 3 else ""
+                # Same pipeline as the HTTP API (cached per round, grid and model)
+                results = predict_race(bundle, round_number, ordered_grid).results
                 
-                # Build points badge HTML separately
-                if pts > 0:
-                    points_section = f'<div class="points-badge">{pts} PTS</div>'
-                else:
-                    points_section = ''
+                # ===== DISPLAY RESULTS =====
+                # Whole board in one element so it reaches the browser in one frame
+                st.markdown(results_board_html(results, driver_full_names, TEAM_COLORS), unsafe_allow_html=True)
                 
-                # Build confidence section separately
-                confidence_section = f'''<div style="margin-left: 1rem; width: 100px;">
-                            <div style="color: rgba(255,255,255,0.6); font-size: 0.8rem;">Confidence</div>
-                            <div style="color: white; font-weight: 700;">{confidence}%</div>
-                            <div class="confidence-bar">
-                                <div class="confidence-fill" style="width: {confidence}%;"></div>
-                            </div>
-                        </div>'''
+                # ===== VISUALIZATION =====
+                st.markdown('<div class="section-header">📊 Position Changes</div>', unsafe_allow_html=True)
+                fig = position_chart(results, driver_full_names, TEAM_COLORS)
+                with metrics.span("chart_serialize"):
+                    st.plotly_chart(fig, use_container_width=True)
                 
-                # Build complete HTML without nested f-strings
-                html_output = '<div class="position-row ' + position_class + '" style="border-left-color: ' + team_color + ';">' + \
-                    '<div class="position-number">' + str(idx) + '</div>' + \
-                    '<div class="driver-info">' + \
-                        '<div class="driver-name">' + driver_name + '</div>' + \
-                        '<div class="driver-abbr">' + driver_abbr + '</div>' + \
-                    '</div>' + \
-                    '<div class="grid-pos">Grid: P' + str(grid_pos) + '</div>' + \
-                    points_section + \
-                    confidence_section + \
-                    '</div>'
+            # ===== MONTE CARLO SIMULATION =====
+            if run_simulation:
+                with st.spinner(f"🎲 Simulating {SIMULATION_RUNS:,} races..."):
+                    with metrics.span("simulation"):
+                        simulation = simulate_race(bundle, round_number, grid, n_sims=SIMULATION_RUNS, season=entry.season)
                 
-                st.markdown(html_output, unsafe_allow_html=True)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            # ===== VISUALIZATION =====
-            st.markdown('<div class="section-header">📊 Position Changes</div>', unsafe_allow_html=True)
-            
-            fig = go.Figure()
-            
-            for _, row in results.iterrows():
-                driver_abbr = row["Abbreviation"]
-                team_color = TEAM_COLORS.get(driver_abbr, "#FFFFFF")
+                st.markdown('<div class="section-header">🎲 Race Simulation</div>', unsafe_allow_html=True)
                 
-                fig.add_trace(go.Scatter(
-                    x=[0, 1],
-                    y=[row["GridPosition"], row.name],
-                    mode='lines+markers+text',
-                    name=driver_abbr,
-                    line=dict(color=team_color, width=3),
-                    marker=dict(size=12, color=team_color),
-                    text=[driver_abbr, driver_abbr],
-                    textposition=['middle left', 'middle right'],
-                    textfont=dict(size=10, color=team_color, family='Titillium Web'),
-                    hovertemplate=f'{driver_full_names[driver_abbr]}<br>Grid: P{int(row["GridPosition"])}<br>Predicted: P{row.name}<extra></extra>'
-                ))
-            
-            fig.update_layout(
-                title="Grid Position → Predicted Finish",
-                xaxis=dict(
-                    tickmode='array',
-                    tickvals=[0, 1],
-                    ticktext=['Grid', 'Predicted'],
-                    showgrid=False,
-                    zeroline=False
-                ),
-                yaxis=dict(
-                    title='Position',
-                    autorange='reversed',
-                    showgrid=True,
-                    gridcolor='rgba(255,255,255,0.1)',
-                    zeroline=False
-                ),
-                showlegend=False,
-                height=700,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='white', family='Titillium Web'),
-                hovermode='closest'
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Statistics
-            st.markdown('<div class="section-header">📈 Race Statistics</div>', unsafe_allow_html=True)
-            
-            stat_cols = st.columns(4)
-            
-            biggest_gainer = results.loc[(results["GridPosition"] - results.index).idxmax()]
-            biggest_loser = results.loc[(results["GridPosition"] - results.index).idxmin()]
-            avg_confidence = results["Confidence"].mean()
-            
-            with stat_cols[0]:
-                positions_gained = int(biggest_gainer["GridPosition"] - biggest_gainer.name)
-                st.markdown(f"""
-                    <div class="race-info-card">
-                        <div class="race-info-label">Biggest Gainer</div>
-                        <div class="race-info-value">{biggest_gainer["Abbreviation"]}</div>
-                        <div style="color: #00FF00; font-size: 1rem;">↑ {positions_gained} positions</div>
-                    </div>
-                """, unsafe_allow_html=True)
-            
-            with stat_cols[1]:
-                positions_lost = int(biggest_loser.name - biggest_loser["GridPosition"])
-                st.markdown(f"""
-                    <div class="race-info-card">
-                        <div class="race-info-label">Biggest Loser</div>
-                        <div class="race-info-value">{biggest_loser["Abbreviation"]}</div>
-                        <div style="color: #FF0000; font-size: 1rem;">↓ {positions_lost} positions</div>
-                    </div>
-                """, unsafe_allow_html=True)
-            
-            with stat_cols[2]:
-                st.markdown(f"""
-                    <div class="race-info-card">
-                        <div class="race-info-label">Avg Confidence</div>
-                        <div class="race-info-value">{avg_confidence:.1f}%</div>
-                    </div>
-                """, unsafe_allow_html=True)
-            
-            with stat_cols[3]:
-                st.markdown(f"""
-                    <div class="race-info-card">
-                        <div class="race-info-label">Total Drivers</div>
-                        <div class="race-info-value">20</div>
-                    </div>
-                """, unsafe_allow_html=True)
+                sim_summary = simulation.summary()
+                sim_summary.insert(1, "Driver", sim_summary["Abbreviation"].map(driver_full_names))
+                sim_summary.index += 1
+                st.dataframe(
+                    sim_summary,
+                    use_container_width=True,
+                    column_config={
+                        "ExpectedPosition": st.column_config.NumberColumn("Avg Finish", format="P%.1f"),
+                        "WinProb": st.column_config.ProgressColumn("Win", format="%.2f", min_value=0, max_value=1),
+                        "PodiumProb": st.column_config.ProgressColumn("Podium", format="%.2f", min_value=0, max_value=1),
+                        "PointsProb": st.column_config.ProgressColumn("Points", format="%.2f", min_value=0, max_value=1),
+                        "DNFProb": st.column_config.NumberColumn("DNF", format="%.2f"),
+                        "ExpectedPoints": st.column_config.NumberColumn("Exp. Points", format="%.1f"),
+                    },
+                )
+
+# ===== METRICS =====
+with st.sidebar.expander("📈 Metrics"):
+    counters = metrics.counters()
+    st.metric("Prediction cache hits", counters.get("prediction_cache_hits_total", 0))
+    st.metric("Prediction cache misses", counters.get("prediction_cache_misses_total", 0))
+    st.metric("Predictions", counters.get("predictions_total", 0))
+    st.metric("Prediction errors", counters.get("prediction_errors_total", 0))
+    stage_times = metrics.spans()
+    if stage_times:
+        st.dataframe(
+            pd.DataFrame(
+                [(stage, count, total / count * 1e3) for stage, (count, total) in sorted(stage_times.items())],
+                columns=["Stage", "Calls", "Mean ms"],
+            ),
+            hide_index=True,
+        )
+    st.caption(f"{len(prediction_cache)} cached grids · model {entry.id} ({bundle.version[:8]})")
 
 # Footer
 st.markdown("---")
-st.markdown("""
+st.markdown(f"""
     <div style="text-align: center; color: rgba(255,255,255,0.5); padding: 2rem;">
-        <p>Powered by FastF1 & Machine Learning | Data from 2024 Season</p>
+        <p>Powered by FastF1 & Machine Learning | Data from {entry.season} Season</p>
     </div>
 """, unsafe_allow_html=True)
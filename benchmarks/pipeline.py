@@ -0,0 +1,225 @@
+"""Prediction pipeline benchmark with regression tracking.
+
+Measures the committed artifacts in ``model/``:
+
+* model load time (fresh interpreter, compiled bundle and stacking pickle);
+* single-grid latency p50/p99 for each stage (feature matrix, scaler,
+  compiled and stacking predict, sort + points, results board render) and
+  end to end through ``service.predict_races``;
+* batch throughput at 1, 100 and 10k grids;
+* peak traced memory of the 10k-grid batch.
+
+Each metric is the median over ``--rounds`` full passes. Results are written
+as JSON and compared with ``baseline.json``; a metric more than
+``--tolerance`` worse than the baseline is flagged and the run exits 1:
+
+    python benchmarks/pipeline.py                       # compare with baseline
+    python benchmarks/pipeline.py --output run.json     # also save this run
+    python benchmarks/pipeline.py --update              # re-baseline
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from f1_predictor.bundle import load_bundle  # noqa: E402
+from f1_predictor.cache import prediction_cache  # noqa: E402
+from f1_predictor.features import build_feature_matrix  # noqa: E402
+from f1_predictor.render import position_chart, results_board_html  # noqa: E402
+from f1_predictor.service import RacePrediction, _classify, predict_races  # noqa: E402
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+
+LATENCY_REPEATS = 300
+BATCH_SIZES = (1, 100, 10_000)
+# Relative change counted as a regression (doubled for p99 latencies)
+DEFAULT_TOLERANCE = 0.25
+# Latency changes smaller than this are timer noise, whatever the ratio
+LATENCY_NOISE_MS = 0.05
+
+LOAD_SCRIPT = f"""
+import sys, time
+sys.path.insert(0, {str(ROOT_DIR)!r})
+from f1_predictor.bundle import load_bundle
+start = time.perf_counter()
+bundle = load_bundle()
+loaded = time.perf_counter()
+bundle.model
+print(loaded - start, time.perf_counter() - loaded)
+"""
+
+
+def _random_grids(n_grids, n_drivers, rng):
+    return np.argsort(rng.random((n_grids, n_drivers)), axis=1) + 1.0
+
+
+def _grid_orders(bundle, grids):
+    """Grid-position arrays (driver-table order) -> abbreviations from P1."""
+    abbrs = np.array(bundle.driver_abbrs)
+    return [tuple(abbrs[np.argsort(grid)]) for grid in grids]
+
+
+def _latency(fn, repeats=LATENCY_REPEATS):
+    """(p50, p99) wall time of ``fn()`` in milliseconds."""
+    fn()
+    samples = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples[i] = time.perf_counter() - start
+    return tuple(float(v) * 1e3 for v in np.percentile(samples, [50, 99]))
+
+
+def measure_load():
+    proc = subprocess.run(
+        [sys.executable, "-c", LOAD_SCRIPT], capture_output=True, text=True, check=True, cwd=ROOT_DIR
+    )
+    bundle_seconds, model_seconds = map(float, proc.stdout.split())
+    return {"bundle_load_seconds": bundle_seconds, "stacking_model_load_seconds": model_seconds}
+
+
+def measure_latency(bundle, rng):
+    grid = _random_grids(1, len(bundle.driver_abbrs), rng)[0]
+    features = lambda: build_feature_matrix(  # noqa: E731
+        bundle.feature_columns,
+        Round=5,
+        Abbreviation=bundle.driver_codes,
+        GridPosition=grid,
+        **bundle.driver_stats,
+    )
+    X = features()
+    scores = bundle.predict(X)
+    classified = {name: values[0] for name, values in _classify(bundle, grid[None], scores[None]).items()}
+    results = RacePrediction(5, tuple(bundle.driver_abbrs), **classified).results
+    model, scaler = bundle.model, bundle.scaler
+
+    # End to end with a cache miss on every call
+    orders = iter(_grid_orders(bundle, _random_grids(LATENCY_REPEATS + 1, len(grid), rng)))
+
+    stages = {
+        "features": features,
+        "scaler": lambda: (X - scaler.mean_) / scaler.scale_,
+        "predict_compiled": lambda: bundle.predict(X),
+        "predict_stacking": lambda: model.predict((X - scaler.mean_) / scaler.scale_),
+        "sort_points": lambda: _classify(bundle, grid[None], scores[None]),
+        "render_board": lambda: results_board_html(results, bundle.driver_names, {}),
+        "render_chart": lambda: position_chart(results, bundle.driver_names, {}).to_json(),
+        "end_to_end": lambda: predict_races(bundle, [(5, next(orders))]),
+    }
+    metrics = {}
+    for stage, fn in stages.items():
+        repeats = 50 if stage in ("predict_stacking", "render_chart") else LATENCY_REPEATS
+        p50, p99 = _latency(fn, repeats)
+        metrics[f"{stage}_p50_ms"] = p50
+        metrics[f"{stage}_p99_ms"] = p99
+    return metrics
+
+
+def measure_throughput(bundle, rng):
+    metrics = {}
+    n_drivers = len(bundle.driver_abbrs)
+    for n_grids in BATCH_SIZES:
+        requests = [(int(rnd), order) for rnd, order in zip(
+            rng.integers(1, 25, n_grids), _grid_orders(bundle, _random_grids(n_grids, n_drivers, rng))
+        )]
+        repeats = max(1, 1_000 // n_grids)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            prediction_cache.clear()
+            predict_races(bundle, requests)
+        seconds = (time.perf_counter() - start) / repeats
+        metrics[f"batch_{n_grids}_grids_per_second"] = n_grids / seconds
+
+    prediction_cache.clear()
+    tracemalloc.start()
+    predict_races(bundle, requests)
+    metrics["batch_10000_peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return metrics
+
+
+def run_once(bundle, seed=0):
+    rng = np.random.default_rng(seed)
+    metrics = measure_load()
+    metrics.update(measure_latency(bundle, rng))
+    metrics.update(measure_throughput(bundle, rng))
+    return metrics
+
+
+def run(rounds=3, seed=0):
+    """Median of each metric over ``rounds`` full passes."""
+    bundle = load_bundle()
+    passes = [run_once(bundle, seed) for _ in range(rounds)]
+    metrics = {name: float(np.median([p[name] for p in passes])) for name in passes[0]}
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "model_version": bundle.version,
+            "compiled": bundle.compiled is not None,
+            "rounds": rounds,
+        },
+        "metrics": metrics,
+    }
+
+
+def higher_is_better(name):
+    return name.endswith("_per_second")
+
+
+def compare(result, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Regressions of ``result`` against ``baseline`` as readable lines."""
+    regressions = []
+    for name, base in baseline["metrics"].items():
+        value = result["metrics"].get(name)
+        if value is None or not base:
+            continue
+        if name.endswith("_ms") and abs(value - base) < LATENCY_NOISE_MS:
+            continue
+        change = value / base - 1
+        worse = -change if higher_is_better(name) else change
+        if worse > (2 * tolerance if "_p99_" in name else tolerance):
+            regressions.append(f"{name}: {value:.4g} vs baseline {base:.4g} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the prediction pipeline against the stored baseline.")
+    parser.add_argument("--rounds", type=int, default=3, help="full passes; metrics are their median")
+    parser.add_argument("--output", type=Path, help="write this run's JSON here")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update", action="store_true", help="store this run as the baseline")
+    args = parser.parse_args()
+
+    result = run(args.rounds)
+    text = json.dumps(result, indent=2) + "\n"
+    print(text, end="")
+    if args.output:
+        args.output.write_text(text)
+    if args.update:
+        args.baseline.write_text(text)
+        print(f"Updated {args.baseline}", file=sys.stderr)
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline["environment"]["model_version"] != result["environment"]["model_version"]:
+        print("Note: model artifacts changed since the baseline", file=sys.stderr)
+    regressions = compare(result, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
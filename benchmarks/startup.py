@@ -0,0 +1,140 @@
+"""Cold-start benchmark: imports, bundle load and first prediction in a fresh interpreter.
+
+Each run starts a new ``python -X importtime`` process that imports what
+``app.py`` imports, loads the default registered model and scores one grid,
+the work a scale-to-zero replica does before it can serve its first page. The median
+over the runs is checked against ``startup_budget.json``, and the project
+imports must not pull in any of the budget's forbidden modules (on top of
+what Streamlit itself imports):
+
+    python benchmarks/startup.py            # exits 1 when over budget
+    python benchmarks/startup.py --update   # re-baseline the budget
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BUDGET_FILE = Path(__file__).resolve().parent / "startup_budget.json"
+
+# Headroom applied to measured times by --update
+BUDGET_HEADROOM = 2.0
+
+STARTUP_SCRIPT = f"""
+import json, sys, time
+sys.path.insert(0, {str(ROOT_DIR)!r})
+start = time.perf_counter()
+import streamlit
+streamlit_done = time.perf_counter()
+preloaded = set(sys.modules)
+from f1_predictor import metrics
+from f1_predictor.cache import prediction_cache
+from f1_predictor.ingest import qualifying_order
+from f1_predictor.registry import get_bundle, read_registry
+from f1_predictor.render import position_chart, results_board_html
+from f1_predictor.schedule import get_schedule
+from f1_predictor.season import average_quali_grid
+from f1_predictor.service import grid_positions, predict_race
+from f1_predictor.simulation import simulate_race
+imports_done = time.perf_counter()
+entry, bundle = get_bundle()
+predict_race(bundle, 1, bundle.driver_abbrs)
+done = time.perf_counter()
+print(json.dumps({{
+    "streamlit_import_seconds": streamlit_done - start,
+    "import_seconds": imports_done - streamlit_done,
+    "first_prediction_seconds": done - imports_done,
+    "modules": sorted(set(sys.modules) - preloaded),
+}}))
+"""
+
+
+def _parse_importtime(stderr):
+    """``-X importtime`` output -> {module: cumulative microseconds}."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure_once():
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT_DIR,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["importtime"] = _parse_importtime(proc.stderr)
+    return result
+
+
+def measure(runs=5):
+    results = [measure_once() for _ in range(runs)]
+    summary = {
+        key: statistics.median(result[key] for result in results)
+        for key in ("streamlit_import_seconds", "import_seconds", "first_prediction_seconds")
+    }
+    summary["modules"] = results[-1]["modules"]
+    # Slowest top-level project imports in the last run
+    importtime = results[-1]["importtime"]
+    summary["slowest_imports"] = sorted(
+        ((name, micros / 1e6) for name, micros in importtime.items() if name.startswith("f1_predictor")),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:5]
+    return summary
+
+
+def check(summary, budget):
+    """List of budget violations (empty when within budget)."""
+    failures = [
+        f"{key} {summary[key]:.3f}s > budget {limit:.3f}s"
+        for key, limit in budget["seconds"].items()
+        if summary[key] > limit
+    ]
+    loaded = set(summary["modules"])
+    failures += [
+        f"{module} is imported on the serving path"
+        for module in budget["forbidden_modules"]
+        if module in loaded
+    ]
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold start against the tracked budget.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--update", action="store_true", help="rewrite the budget from this run")
+    args = parser.parse_args()
+
+    summary = measure(args.runs)
+    for key in ("streamlit_import_seconds", "import_seconds", "first_prediction_seconds"):
+        print(f"{key:<26} {summary[key]:.3f}s")
+    for name, seconds in summary["slowest_imports"]:
+        print(f"  {name:<32} {seconds:.3f}s")
+
+    budget = json.loads(BUDGET_FILE.read_text())
+    if args.update:
+        budget["seconds"] = {
+            key: round(summary[key] * BUDGET_HEADROOM, 3) for key in ("import_seconds", "first_prediction_seconds")
+        }
+        BUDGET_FILE.write_text(json.dumps(budget, indent=2) + "\n")
+        print(f"Updated {BUDGET_FILE}")
+        return
+
+    failures = check(summary, budget)
+    for failure in failures:
+        print(f"OVER BUDGET: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared building blocks for the F1 Race Predictor app, notebooks and scripts."""
@@ -0,0 +1,182 @@
+"""Incrementally maintained driver and team aggregates.
+
+``build_features.ipynb`` used to recompute points totals and average grid /
+finishing positions with ``groupby`` passes over the whole results table.
+``AggregateStore`` keeps running counts and sums per driver and per team
+instead, so applying a race costs O(rows in that race). It also keeps the last
+``window`` races per driver and team and exponentially weighted means, which
+gives recent-form versions of the same stats without rescanning history.
+
+A team contributes one value per race: its cars' points summed and their grid
+and finishing positions averaged, so team counts, rolling windows and EWM
+steps all follow races rather than individual results.
+
+The store remembers which (season, round) sessions it has applied;
+``refresh`` reads only the sessions in the results store it has not seen yet.
+
+    python -m f1_predictor.aggregates --out model/DATA/driver_aggregates.csv
+"""
+import argparse
+import pickle
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .paths import DATA_DIR
+from .store import load_results, read_manifest
+
+AGGREGATES_FILE = DATA_DIR / "aggregates.pkl"
+
+AGGREGATE_COLUMNS = ["Season", "Round", "Abbreviation", "TeamId", "GridPosition", "Position", "Points"]
+# Per-result values tracked for each driver
+_STATS = ("GridPosition", "Position", "Points")
+# Bumped when the meaning of the saved aggregates changes; older pickles are rebuilt
+STORE_VERSION = 2
+
+
+@dataclass
+class _Running:
+    """Sums and counts of one driver's (or team's) races, plus recent form."""
+
+    window: int
+    races: int = 0
+    sums: dict = field(default_factory=lambda: dict.fromkeys(_STATS, 0.0))
+    counts: dict = field(default_factory=lambda: dict.fromkeys(_STATS, 0))
+    ewm: dict = field(default_factory=dict)
+    recent: deque = None
+
+    def __post_init__(self):
+        self.recent = deque(maxlen=self.window)
+
+    def add(self, values, alpha):
+        self.races += 1
+        for stat, value in zip(_STATS, values):
+            if np.isnan(value):
+                continue
+            self.sums[stat] += value
+            self.counts[stat] += 1
+            previous = self.ewm.get(stat)
+            self.ewm[stat] = value if previous is None else previous + alpha * (value - previous)
+        self.recent.append(values)
+
+    def mean(self, stat):
+        return self.sums[stat] / self.counts[stat] if self.counts[stat] else np.nan
+
+    def rolling_mean(self, stat):
+        values = np.array([row[_STATS.index(stat)] for row in self.recent], dtype=np.float64)
+        return np.nanmean(values) if np.isfinite(values).any() else np.nan
+
+
+class AggregateStore:
+    """Running per-driver and per-team aggregates over applied races.
+
+    ``window`` is the number of most recent races in the rolling means and
+    ``alpha`` the smoothing factor of the exponentially weighted means
+    (``m = m + alpha * (x - m)``, seeded with the first value).
+    """
+
+    def __init__(self, window=5, alpha=0.3):
+        self.version = STORE_VERSION
+        self.window = window
+        self.alpha = alpha
+        self.drivers = {}
+        self.teams = {}
+        self.sessions = set()
+
+    def update(self, results, season, round_number):
+        """Apply one race's results; re-applying a known session is a no-op."""
+        if (season, round_number) in self.sessions:
+            return False
+
+        values = results[list(_STATS)].to_numpy(dtype=np.float64)
+        for abbr, row in zip(results["Abbreviation"], values):
+            self.drivers.setdefault(abbr, _Running(self.window)).add(tuple(row), self.alpha)
+
+        teams = results.groupby("TeamId", sort=False, observed=True).agg(
+            GridPosition=("GridPosition", "mean"),
+            Position=("Position", "mean"),
+            Points=("Points", lambda points: points.sum(min_count=1)),
+        )
+        for team, row in zip(teams.index, teams[list(_STATS)].to_numpy(dtype=np.float64)):
+            self.teams.setdefault(team, _Running(self.window)).add(tuple(row), self.alpha)
+        self.sessions.add((season, round_number))
+        return True
+
+    def refresh(self):
+        """Apply every stored session not seen yet, in race order. Returns them."""
+        pending = sorted(set(read_manifest()) - self.sessions)
+        if not pending:
+            return []
+
+        results = load_results(AGGREGATE_COLUMNS, sessions=pending)
+        for (season, round_number), race in results.groupby(["Season", "Round"], sort=True):
+            self.update(race, season, round_number)
+        return pending
+
+    def _table(self, running, key):
+        rows = []
+        for name, agg in running.items():
+            rows.append({
+                key: name,
+                "Races": agg.races,
+                "Points": agg.sums["Points"],
+                "AvgQualiPosition": agg.mean("GridPosition"),
+                "AvgRacePosition": agg.mean("Position"),
+                f"RollingQualiPosition{self.window}": agg.rolling_mean("GridPosition"),
+                f"RollingRacePosition{self.window}": agg.rolling_mean("Position"),
+                f"RollingPoints{self.window}": agg.rolling_mean("Points"),
+                "EwmQualiPosition": agg.ewm.get("GridPosition", np.nan),
+                "EwmRacePosition": agg.ewm.get("Position", np.nan),
+                "EwmPoints": agg.ewm.get("Points", np.nan),
+            })
+        return pd.DataFrame(rows)
+
+    def driver_table(self):
+        return self._table(self.drivers, "Abbreviation")
+
+    def team_table(self):
+        return self._table(self.teams, "TeamId")
+
+    @classmethod
+    def load(cls, path=AGGREGATES_FILE, window=5, alpha=0.3):
+        """Load a saved store, or start an empty one if there is none.
+
+        A store saved with a different ``window``/``alpha`` (or by an older
+        version) is discarded; the next ``refresh`` rebuilds it from the
+        results store.
+        """
+        if path.exists():
+            with open(path, "rb") as f:
+                store = pickle.load(f)
+            if (getattr(store, "version", 1), store.window, store.alpha) == (STORE_VERSION, window, alpha):
+                return store
+        return cls(window=window, alpha=alpha)
+
+    def save(self, path=AGGREGATES_FILE):
+        tmp_path = path.with_suffix(".pkl.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self, f)
+        tmp_path.replace(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply new races to the driver/team aggregates.")
+    parser.add_argument("--out", help="write the driver table to this CSV")
+    parser.add_argument("--teams-out", help="write the team table to this CSV")
+    args = parser.parse_args()
+
+    aggregates = AggregateStore.load()
+    applied = aggregates.refresh()
+    aggregates.save()
+    print(f"Applied {len(applied)} new session(s); {len(aggregates.sessions)} in total.")
+
+    if args.out:
+        aggregates.driver_table().to_csv(args.out, index=False)
+    if args.teams_out:
+        aggregates.team_table().to_csv(args.teams_out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Stateless HTTP prediction API.
+
+Serves the same pipeline as the Streamlit app (``service.py``) without a
+browser session per client. The default model's bundle is loaded once per
+worker process at startup; other registered models (``registry.py``) are
+loaded on first use and selected with ``?model=<id>``:
+
+    uvicorn f1_predictor.api:app --workers 4 --port 8000
+
+    POST /predict        {"round": 5, "grid": ["VER", "NOR", ...]}
+    POST /predict/batch  {"races": [{"round": 5, "grid": [...]}, ...]}
+    GET  /health         model version, drivers and registered model ids
+    GET  /metrics        Prometheus text format (this worker's counters)
+
+With ``F1_PROFILING=1`` set on the server, an ``X-Profile: 1`` request
+header dumps a cProfile of that prediction into ``profiles/``.
+"""
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+
+from . import metrics
+from .registry import get_bundle, read_registry
+from .service import GridError, predict_races
+
+# Upper bound on races per batch request
+MAX_BATCH = 10_000
+
+
+class RaceRequest(BaseModel):
+    round: int = Field(ge=1, description="Round number in the season")
+    grid: list[str] = Field(description="Driver abbreviations from P1 to P20")
+
+
+class BatchRequest(BaseModel):
+    races: list[RaceRequest] = Field(max_length=MAX_BATCH)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    get_bundle()
+    yield
+
+
+app = FastAPI(title="F1 Race Predictor API", lifespan=lifespan)
+
+
+def _bundle(model_id):
+    try:
+        return get_bundle(model_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=exc.args[0]) from exc
+
+
+def _predict(races, model_id=None, profile=False):
+    _, bundle = _bundle(model_id)
+    try:
+        with metrics.profile("api_predict", requested=profile):
+            predictions = predict_races(bundle, [(race.round, race.grid) for race in races])
+    except GridError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return [prediction.to_dict(bundle.driver_names) for prediction in predictions]
+
+
+def _predict_response(races, model_id, profile, batch):
+    """Predict and serialize in one threadpool call.
+
+    The results are plain ints, floats and strings already, so they go
+    straight to ``json.dumps`` (``JSONResponse`` renders in its constructor)
+    instead of through FastAPI's ``jsonable_encoder`` pass on the event loop.
+    """
+    predictions = _predict(races, model_id, profile)
+    return JSONResponse({"predictions": predictions} if batch else predictions[0])
+
+
+@app.get("/health")
+async def health(model: str | None = Query(default=None)):
+    entry, bundle = _bundle(model)
+    return {
+        "status": "ok",
+        "model": entry.id,
+        "season": entry.season,
+        "model_version": bundle.version,
+        "drivers": bundle.driver_abbrs,
+        "models": list(read_registry().entries),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return metrics.render_prometheus()
+
+
+@app.post("/predict")
+async def predict(race: RaceRequest, model: str | None = Query(default=None), x_profile: str = Header(default="")):
+    # Scoring (and a first load of another model) is CPU-bound; keep it off the event loop
+    return await run_in_threadpool(_predict_response, [race], model, x_profile == "1", False)
+
+
+@app.post("/predict/batch")
+async def predict_batch(
+    batch: BatchRequest, model: str | None = Query(default=None), x_profile: str = Header(default="")
+):
+    return await run_in_threadpool(_predict_response, batch.races, model, x_profile == "1", True)
@@ -0,0 +1,180 @@
+"""Walk-forward backtest of the stacking model, race by race.
+
+``train_model.ipynb`` scores the model on a random split of
+``f1_final_data.csv``, which trains on later races to predict earlier ones and
+uses season-final driver stats for every row. Here every race in the results
+store is predicted by a model fitted only on the races before it, with each
+row's driver stats (points, average grid and finishing position) taken from an
+``AggregateStore`` as they stood before that race.
+
+The point-in-time feature matrix is built once and saved as ``.npy`` files;
+the per-race fits are independent and run in a process pool whose workers
+memory-map those arrays read-only instead of receiving copies. Rows are sorted
+by race, so each fit's training set is a contiguous prefix of the matrix.
+
+Per race the report has position MAE, podium hit-rate and points error for the
+model and for a "finish where you start" grid-order baseline:
+
+    python -m f1_predictor.backtest --workers 4 --out backtest.csv
+"""
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import AGGREGATE_COLUMNS, AggregateStore
+from .features import DRIVER_STAT_COLUMNS, FEATURE_COLUMNS, build_feature_matrix, position_tier
+from .scoring import points_for_positions
+from .store import load_results
+
+# Races the first fit needs before it is worth predicting anything
+MIN_TRAIN_RACES = 3
+# Stats for a driver's first race (no history yet): a midfield driver without points
+DEBUT_STATS = {"Points": 0.0, "AvgQualiPosition": 10.5, "AvgRacePosition": 10.5}
+# Pit-lane starts are stored as grid 0
+PIT_LANE_GRID = 21
+
+
+def point_in_time_features(results):
+    """Results -> (frame, race boundaries) with pre-race driver stats as ``Pre<stat>`` columns.
+
+    ``results`` holds ``AGGREGATE_COLUMNS``. Rows come back sorted by race, and
+    ``bounds[k]:bounds[k + 1]`` are the rows of the k-th race.
+    """
+    aggregates = AggregateStore()
+    races = []
+    for (season, round_number), race in results.groupby(["Season", "Round"], sort=True):
+        stats = aggregates.driver_table()
+        stats = stats.set_index("Abbreviation")[DRIVER_STAT_COLUMNS] if len(stats) else pd.DataFrame(
+            columns=DRIVER_STAT_COLUMNS, dtype=np.float64
+        )
+        pre_race = stats.reindex(race["Abbreviation"].astype(str)).fillna(DEBUT_STATS)
+        # The race's own Points column is the result; pre-race stats get a prefix
+        races.append(pd.concat([race.reset_index(drop=True), pre_race.add_prefix("Pre").reset_index(drop=True)], axis=1))
+        aggregates.update(race, season, round_number)
+
+    frame = pd.concat(races, ignore_index=True)
+    bounds = np.concatenate([[0], np.cumsum([len(race) for race in races])])
+    return frame, bounds
+
+
+def _ranks(values, tiebreak):
+    """1-based finishing order of ``values`` (ascending), ties broken by ``tiebreak``."""
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[np.lexsort((tiebreak, values))] = np.arange(1, len(values) + 1)
+    return ranks
+
+
+def race_metrics(predicted, actual):
+    """Position MAE, podium hit-rate and mean absolute points error for one race."""
+    podium = len(set(np.flatnonzero(predicted <= 3)) & set(np.flatnonzero(actual <= 3))) / 3
+    return {
+        "PositionMAE": float(np.mean(np.abs(predicted - actual))),
+        "PodiumHitRate": podium,
+        "PointsError": float(np.mean(np.abs(points_for_positions(predicted) - points_for_positions(actual)))),
+    }
+
+
+def _fit_predict(arrays_dir, train_end, test_end, gbr_params, random_state):
+    """Worker: fit on rows ``[:train_end]`` of the memmapped arrays, score ``[train_end:test_end]``."""
+    from sklearn.ensemble import GradientBoostingRegressor
+    from sklearn.model_selection import KFold
+    from sklearn.preprocessing import StandardScaler
+
+    from .training import make_stack
+
+    X = np.load(Path(arrays_dir) / "X.npy", mmap_mode="r")
+    y = np.load(Path(arrays_dir) / "y.npy", mmap_mode="r")
+    X_train, y_train = np.asarray(X[:train_end]), np.asarray(y[:train_end])
+
+    scaler = StandardScaler().fit(X_train)
+    folds = list(KFold(n_splits=5, shuffle=True, random_state=random_state).split(X_train))
+    gbr = GradientBoostingRegressor(**gbr_params)
+    stack = make_stack(gbr, folds, workers=1).fit(scaler.transform(X_train), y_train)
+    return stack.predict(scaler.transform(np.asarray(X[train_end:test_end])))
+
+
+def committed_gbr_params():
+    """GBR hyperparameters of the committed model, so the backtest scores its configuration."""
+    from .bundle import load_bundle
+
+    return load_bundle().model.named_estimators_["gbr"].get_params()
+
+
+def backtest(seasons=None, workers=None, min_train_races=MIN_TRAIN_RACES, gbr_params=None, random_state=42):
+    """Walk forward over the stored races; returns one row of metrics per predicted race."""
+    from sklearn.preprocessing import LabelEncoder
+
+    results = load_results(AGGREGATE_COLUMNS, seasons=seasons)
+    frame, bounds = point_in_time_features(results)
+    # Codes only order drivers; fitting on every abbreviation leaks no results
+    frame["Abbreviation"] = LabelEncoder().fit_transform(frame["Abbreviation"].astype(str))
+    grid = np.where(frame["GridPosition"] > 0, frame["GridPosition"], PIT_LANE_GRID)
+    X = build_feature_matrix(
+        FEATURE_COLUMNS,
+        Round=frame["Round"].to_numpy(),
+        Abbreviation=frame["Abbreviation"].to_numpy(),
+        GridPosition=grid,
+        **{name: frame[f"Pre{name}"].to_numpy() for name in DRIVER_STAT_COLUMNS},
+    )
+    y = position_tier(frame["Position"]).astype(np.float64)
+    gbr_params = gbr_params if gbr_params is not None else committed_gbr_params()
+
+    races = range(min_train_races, len(bounds) - 1)
+    with tempfile.TemporaryDirectory(prefix="f1-backtest-") as arrays_dir:
+        np.save(Path(arrays_dir) / "X.npy", X)
+        np.save(Path(arrays_dir) / "y.npy", y)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_fit_predict, arrays_dir, bounds[k], bounds[k + 1], gbr_params, random_state)
+                for k in races
+            ]
+            scores = [future.result() for future in futures]
+
+    rows = []
+    for k, race_scores in zip(races, scores):
+        race = slice(bounds[k], bounds[k + 1])
+        race_grid = grid[race]
+        actual = _ranks(frame["Position"].to_numpy()[race], race_grid)
+        model = race_metrics(_ranks(race_scores, race_grid), actual)
+        baseline = race_metrics(_ranks(race_grid, race_grid), actual)
+        rows.append({
+            "Season": int(frame["Season"].iat[bounds[k]]),
+            "Round": int(frame["Round"].iat[bounds[k]]),
+            "TrainRows": int(bounds[k]),
+            **model,
+            **{f"Grid{name}": value for name, value in baseline.items()},
+        })
+
+    report = pd.DataFrame(rows)
+    # Running averages show how the error evolves through the season
+    for name in ("PositionMAE", "PodiumHitRate", "PointsError"):
+        report[f"Cumulative{name}"] = report[name].expanding().mean()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest: train on past races, predict the next.")
+    parser.add_argument("--seasons", type=int, nargs="+", help="default: every season in the results store")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--min-train-races", type=int, default=MIN_TRAIN_RACES)
+    parser.add_argument("--out", help="write the per-race report to this CSV")
+    args = parser.parse_args()
+
+    report = backtest(args.seasons, workers=args.workers, min_train_races=args.min_train_races)
+    columns = ["Season", "Round", "TrainRows", "PositionMAE", "GridPositionMAE", "PodiumHitRate",
+               "GridPodiumHitRate", "PointsError", "GridPointsError"]
+    print(report[columns].to_string(index=False, float_format="%.2f"))
+    print()
+    for name in ("PositionMAE", "PodiumHitRate", "PointsError"):
+        print(f"{name:<14} model {report[name].mean():6.2f}   grid order {report['Grid' + name].mean():6.2f}")
+
+    if args.out:
+        report.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Process-wide cache of the trained model artifacts.
+
+Streamlit re-executes ``app.py`` on every widget change, so loading the pickles
+at the top of the script unpickles the whole StackingRegressor again for each
+interaction. ``load_bundle`` keeps one loaded copy per model directory,
+shares it between all sessions and only rebuilds it when one of the artifact
+files changes on disk. At most ``MAX_BUNDLES`` directories stay loaded; the
+least recently used one is dropped when another is loaded, so serving many
+seasons from one process keeps memory flat.
+
+When a current compiled predictor is present (``compiled.py``) the bundle is
+built without unpickling the stacking model, scaler or encoder, so serving
+never imports sklearn or xgboost. The pickles are loaded on first access to
+``model`` / ``scaler`` only, e.g. by tooling or the fallback predict path.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import metrics
+from .compiled import COMPILED_FILE, CompiledPredictor, source_version
+from .encoding import DriverEncoding
+from .features import driver_stats
+from .paths import MODEL_DIR
+
+MODEL_FILE = "f1_race_predictor_model.pkl"
+SCALER_FILE = "scaler.pkl"
+FEATURE_COLUMNS_FILE = "feature_columns.pkl"
+ENCODER_FILE = "driver_encoder.pkl"
+DRIVERS_FILE = "DATA/filtered_drivers_info.csv"
+TEAM_COLORS_FILE = "team_colors.json"
+# Rows the model was trained on, kept next to the artifacts (simulation residuals)
+TRAINING_DATA_FILE = "DATA/f1_final_data.csv"
+
+ARTIFACT_FILES = (MODEL_FILE, SCALER_FILE, FEATURE_COLUMNS_FILE, ENCODER_FILE, DRIVERS_FILE)
+# Used when present (see compiled.py); predictions fall back to the stacking model
+OPTIONAL_FILES = (COMPILED_FILE,)
+# Display-only (abbreviation -> hex colour map): watched for changes, but left
+# out of the version hash since it cannot change a prediction
+DISPLAY_FILES = (TEAM_COLORS_FILE,)
+
+# Loaded bundles kept per process (least recently used dropped first)
+MAX_BUNDLES = int(os.environ.get("F1_MAX_BUNDLES", "4"))
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """Everything needed to score a grid, loaded once and treated as read-only."""
+
+    model_dir: Path
+    feature_columns: list
+    drivers: pd.DataFrame  # driver table indexed by Abbreviation
+    driver_stats: dict  # per-driver stat arrays in ``drivers`` row order
+    encoding: DriverEncoding  # trained abbreviation -> code lookup
+    driver_codes: np.ndarray  # encoded Abbreviation feature in ``drivers`` row order
+    version: str  # sha256 over the artifact contents
+    compiled: CompiledPredictor = None  # flattened predictor, if exported for this model
+    team_colors: dict = None  # abbreviation -> hex colour, if shipped with the model
+
+    @cached_property
+    def model(self):
+        import joblib
+
+        return joblib.load(self.model_dir / MODEL_FILE)
+
+    @cached_property
+    def scaler(self):
+        import joblib
+
+        return joblib.load(self.model_dir / SCALER_FILE)
+
+    @property
+    def driver_abbrs(self):
+        return self.drivers.index.tolist()
+
+    @cached_property
+    def driver_rows(self):
+        """Abbreviation -> row in the driver table, for per-request grid lookups."""
+        return {abbr: row for row, abbr in enumerate(self.drivers.index)}
+
+    @property
+    def driver_names(self):
+        return self.drivers["DriverName"].to_dict()
+
+    def predict(self, X):
+        """Scale and score a feature matrix built by ``features.build_feature_matrix``.
+
+        Uses the compiled predictor when one was exported for this model.
+        Otherwise applies the fitted StandardScaler as ``(X - mean_) / scale_``
+        directly on the array, which is what ``scaler.transform`` computes
+        without the DataFrame feature-name checks, and runs the stacking model.
+        """
+        if self.compiled is not None:
+            return self.compiled.predict(X)
+        with metrics.span("scale"):
+            X = (X - self.scaler.mean_) / self.scaler.scale_
+        return self.model.predict(X)
+
+
+_lock = threading.Lock()
+# model_dir -> (stat fingerprint, bundle), least recently used first
+_bundles = OrderedDict()
+
+
+def _artifact_names(model_dir):
+    return ARTIFACT_FILES + tuple(name for name in OPTIONAL_FILES if (model_dir / name).exists())
+
+
+def _fingerprint(model_dir):
+    """Cheap change detector: (name, mtime, size) of every artifact and display file."""
+    fingerprint = []
+    names = _artifact_names(model_dir) + tuple(name for name in DISPLAY_FILES if (model_dir / name).exists())
+    for name in names:
+        stat = (model_dir / name).stat()
+        fingerprint.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(fingerprint)
+
+
+def _content_hash(model_dir):
+    digest = hashlib.sha256()
+    for name in _artifact_names(model_dir):
+        digest.update(name.encode())
+        digest.update((model_dir / name).read_bytes())
+    return digest.hexdigest()
+
+
+def _read_team_colors(model_dir):
+    path = model_dir / TEAM_COLORS_FILE
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+def _read_bundle(model_dir, version):
+    import joblib
+
+    drivers = pd.read_csv(model_dir / DRIVERS_FILE)
+    # The CSV carries a leftover unnamed index column from build_features.ipynb
+    drivers = drivers.drop(columns="x", errors="ignore").set_index("Abbreviation")
+
+    compiled = None
+    if (model_dir / COMPILED_FILE).exists():
+        compiled = CompiledPredictor.load(model_dir / COMPILED_FILE)
+        if compiled.source_version != source_version(model_dir):
+            # Exported from an older model, scaler or encoder: stale, ignore it
+            compiled = None
+
+    if compiled is not None and len(compiled.driver_classes):
+        encoding = DriverEncoding.from_classes(compiled.driver_classes)
+    else:
+        encoding = DriverEncoding.from_encoder(joblib.load(model_dir / ENCODER_FILE))
+
+    return ModelBundle(
+        model_dir=model_dir,
+        feature_columns=list(joblib.load(model_dir / FEATURE_COLUMNS_FILE)),
+        drivers=drivers,
+        driver_stats=driver_stats(drivers),
+        encoding=encoding,
+        driver_codes=encoding.encode(drivers.index),
+        version=version,
+        compiled=compiled,
+        team_colors=_read_team_colors(model_dir),
+    )
+
+
+def load_bundle(model_dir=MODEL_DIR):
+    """Return the shared ``ModelBundle`` for ``model_dir``.
+
+    Each call only stats the artifact files. The pickles are read again when a
+    file's mtime or size changed *and* its content hash differs from the loaded
+    bundle, so touching a file without changing it does not trigger a reload.
+    """
+    model_dir = Path(model_dir).resolve()
+    fingerprint = _fingerprint(model_dir)
+
+    with _lock:
+        cached = _bundles.get(model_dir)
+        if cached is not None and cached[0] == fingerprint:
+            _bundles.move_to_end(model_dir)
+            return cached[1]
+
+        version = _content_hash(model_dir)
+        if cached is not None and cached[1].version == version:
+            bundle = cached[1]
+            # Only display files changed: same version, so cached predictions stay valid
+            team_colors = _read_team_colors(model_dir)
+            if team_colors != bundle.team_colors:
+                bundle = replace(bundle, team_colors=team_colors)
+        else:
+            with metrics.span("model_load"):
+                bundle = _read_bundle(model_dir, version)
+            metrics.inc("model_loads_total")
+        _bundles[model_dir] = (fingerprint, bundle)
+        _bundles.move_to_end(model_dir)
+        while len(_bundles) > MAX_BUNDLES:
+            _bundles.popitem(last=False)
+            metrics.inc("model_evictions_total")
+        return bundle
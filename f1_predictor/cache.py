@@ -0,0 +1,60 @@
+"""Bounded LRU cache of prediction results.
+
+Entries are keyed by ``(model version, round, grid)`` where ``grid`` is the
+ordered tuple of driver abbreviations from P1 to P20 and the model version is
+the bundle's artifact hash. Several models can be served from one process
+(see ``registry.py``), so entries of different versions share the cache;
+those of a replaced model are never hit again and age out of the LRU.
+"""
+import threading
+from collections import OrderedDict
+
+from . import metrics
+
+
+class PredictionCache:
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, round_number, grid, version):
+        """Cached result for the key, or ``None`` (counted as a miss)."""
+        key = (version, round_number, tuple(grid))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                metrics.inc("prediction_cache_hits_total")
+                return self._entries[key]
+        metrics.inc("prediction_cache_misses_total")
+        return None
+
+    def put(self, round_number, grid, version, result):
+        with self._lock:
+            self._entries[(version, round_number, tuple(grid))] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                metrics.inc("prediction_cache_evictions_total")
+
+    def get_or_compute(self, round_number, grid, version, compute):
+        """Return the cached result for the key, or store and return ``compute()``.
+
+        ``compute`` runs outside the lock; two sessions missing on the same
+        key at once may both compute it, which is harmless.
+        """
+        result = self.get(round_number, grid, version)
+        if result is None:
+            result = compute()
+            self.put(round_number, grid, version, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Shared by all sessions of the server process
+prediction_cache = PredictionCache()
@@ -0,0 +1,358 @@
+"""Flattened, NumPy-only inference path for the stacking model.
+
+``StackingRegressor.predict`` runs the scaler, Ridge, Lasso, XGBRegressor and
+the tuned GBR one after another, each with its own input validation. For the
+20-row grids the app scores, that Python overhead is most of the latency.
+``export_compiled`` folds everything into one ``CompiledPredictor``:
+
+* the StandardScaler is folded into the Ridge and Lasso coefficients, and the
+  final Ridge weights into those, giving a single linear term on raw features;
+* the XGB and GBR trees are packed into flat node arrays (feature, float32
+  threshold, children, leaf value pre-multiplied by learning rate and final
+  weight) and evaluated for all trees at once, level by level;
+* base score, GBR init and every intercept collapse into one constant.
+
+Batches are deduplicated before the trees are evaluated: simulations and
+season runs score the same (driver, round, grid slot) rows over and over, so
+10k simulated grids of 20 drivers contain only a few hundred distinct rows.
+Rows are grouped by a 64-bit hash of their bytes (checked afterwards; a
+collision falls back to an exact byte-wise ``np.unique``).
+
+Speed-up over ``StackingRegressor.predict`` on one CPU: ~30x for 10k grids of
+one round, but only ~9x for 10k grids spread over all rounds (24 rounds x 20
+drivers x 20 slots leave 9,600 distinct rows, and their tree walks alone take
+~0.15 s) and ~5x for a single 20-row grid, where the ~60 NumPy calls of the
+level-by-level walk dominate.
+
+The arrays are saved as ``model/compiled_model.npz`` (no pickle) together with
+the driver encoder classes and the hash of the model, scaler and encoder they
+were exported from, so serving never has to import sklearn or xgboost:
+
+    python -m f1_predictor.compiled                 # export + verify against sklearn
+    python -m f1_predictor.compiled --verify-only   # check the saved file, write nothing
+"""
+import argparse
+import hashlib
+import json
+import time
+
+import numpy as np
+
+from .paths import MODEL_DIR
+
+COMPILED_FILE = "compiled_model.npz"
+
+# Rows evaluated per tree pass; keeps the (trees x rows) temporaries in cache
+TREE_CHUNK_ROWS = 512
+# Below this many rows deduplication costs more than it saves
+DEDUP_MIN_ROWS = 256
+# Saved in the .npz; everything else on the predictor is derived from these
+FIELDS = (
+    "mean", "scale", "coef", "intercept", "feature", "threshold", "children", "value", "roots", "depths",
+    "source_version", "driver_classes",
+)
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+class CompiledPredictor:
+    """Linear term + packed tree ensemble over raw feature rows.
+
+    Trees are stored node-major in flat arrays, grouped by depth so shallow
+    GBR trees are not walked as deep as the XGB ones. ``children[2 * node]``
+    is the right child and ``children[2 * node + 1]`` the left one (taken when
+    ``x <= threshold``); leaves point at themselves.
+    """
+
+    def __init__(
+        self, mean, scale, coef, intercept, feature, threshold, children, value, roots, depths, source_version,
+        driver_classes=(),
+    ):
+        self.mean = mean
+        self.scale = scale
+        self.coef = coef
+        self.intercept = float(intercept)
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.depths = depths
+        self.source_version = str(source_version)
+        # LabelEncoder.classes_ of the driver encoder (code = index)
+        self.driver_classes = np.asarray(driver_classes, dtype=str)
+
+        # Single-leaf trees add a constant; the rest are walked per depth group
+        stumps = self.depths == 0
+        self._constant = self.intercept + float(self.value[self.roots[stumps]].sum())
+        self._depth_groups = [
+            (int(depth), self.roots[self.depths == depth]) for depth in np.unique(self.depths[~stumps])
+        ]
+
+    def _trees(self, X):
+        # Both libraries split on float32 inputs in the scaled space
+        n_rows, n_features = X.shape
+        values = ((X - self.mean) / self.scale).astype(np.float32).ravel()
+
+        out = np.zeros(n_rows)
+        for start in range(0, n_rows, TREE_CHUNK_ROWS):
+            rows = np.arange(start, min(start + TREE_CHUNK_ROWS, n_rows))
+            row_offsets = rows * n_features
+            for depth, roots in self._depth_groups:
+                node = np.repeat(roots, len(rows))
+                offset = np.tile(row_offsets, len(roots))
+                for _ in range(depth):
+                    go_left = values[self.feature[node] + offset] <= self.threshold[node]
+                    node = self.children[2 * node + go_left]
+                out[rows] += self.value[node].reshape(len(roots), len(rows)).sum(axis=0)
+        return out
+
+    def predict(self, X):
+        """Predict from raw (unscaled) features, same columns as the stacking model."""
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        if len(X) < DEDUP_MIN_ROWS:
+            return self._predict(X)
+        first, inverse = _unique_rows(X)
+        return self._predict(X[first])[inverse]
+
+    def _predict(self, X):
+        return X @ self.coef + self._constant + self._trees(X)
+
+    def save(self, path):
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **{name: getattr(self, name) for name in FIELDS})
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(**{name: data[name] for name in data.files})
+
+
+def _unique_rows(X):
+    """``(first, inverse)`` such that ``X[first][inverse]`` equals ``X``."""
+    bits = X.view(np.uint64)
+    key = np.zeros(len(X), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for column in range(X.shape[1]):
+            key = (key ^ bits[:, column]) * _HASH_MULTIPLIER
+            key ^= key >> np.uint64(31)
+    _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+    if not np.array_equal(X[first][inverse], X):
+        rows = X.view(np.dtype((np.void, X.dtype.itemsize * X.shape[1]))).ravel()
+        _, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    return first, inverse.ravel()
+
+
+def source_version(model_dir=MODEL_DIR):
+    """Hash of the model, scaler and encoder files a compiled predictor is exported from."""
+    from .bundle import ENCODER_FILE, MODEL_FILE, SCALER_FILE
+
+    digest = hashlib.sha256()
+    for name in (MODEL_FILE, SCALER_FILE, ENCODER_FILE):
+        digest.update((model_dir / name).read_bytes())
+    return digest.hexdigest()
+
+
+def _float32_at_most(threshold):
+    """Largest float32 <= ``threshold``: for float32 x, ``x <= t`` keeps its result."""
+    rounded = threshold.astype(np.float32)
+    return np.where(rounded > threshold, np.nextafter(rounded, np.float32(-np.inf)), rounded)
+
+
+def _sklearn_trees(gbr, weight):
+    """GBR trees as ``(feature, threshold, left, right, value)`` node arrays."""
+    trees = []
+    for estimator in gbr.estimators_[:, 0]:
+        tree = estimator.tree_
+        is_leaf = tree.children_left < 0
+        nodes = np.arange(tree.node_count)
+        trees.append((
+            np.where(is_leaf, 0, tree.feature),
+            np.where(is_leaf, np.inf, _float32_at_most(tree.threshold)),
+            np.where(is_leaf, nodes, tree.children_left),
+            np.where(is_leaf, nodes, tree.children_right),
+            np.where(is_leaf, tree.value[:, 0, 0] * gbr.learning_rate * weight, 0.0),
+        ))
+    return trees
+
+
+def _xgb_trees(xgb, weight):
+    """XGB trees from the booster's JSON model, ``x < t`` rewritten as ``x <= t'``."""
+    model = json.loads(xgb.get_booster().save_raw("json"))
+    base_score = float(model["learner"]["learner_model_param"]["base_score"].strip("[]"))
+
+    trees = []
+    for tree in model["learner"]["gradient_booster"]["model"]["trees"]:
+        left = np.array(tree["left_children"])
+        right = np.array(tree["right_children"])
+        condition = np.array(tree["split_conditions"], dtype=np.float32)
+        is_leaf = left < 0
+        nodes = np.arange(len(left))
+        trees.append((
+            np.where(is_leaf, 0, tree["split_indices"]),
+            # For float32 x, x < t  <=>  x <= (largest float32 below t)
+            np.where(is_leaf, np.inf, np.nextafter(condition, np.float32(-np.inf))),
+            np.where(is_leaf, nodes, left),
+            np.where(is_leaf, nodes, right),
+            np.where(is_leaf, condition.astype(np.float64) * weight, 0.0),
+        ))
+    return trees, base_score
+
+
+def _tree_depth(left, right):
+    depth = np.zeros(len(left), dtype=np.int64)
+    for node in range(len(left)):  # children always come after their parent
+        if left[node] != node:
+            depth[left[node]] = depth[right[node]] = depth[node] + 1
+    return int(depth.max())
+
+
+def export_compiled(model, scaler, version="", encoder=None):
+    """Fold a fitted StackingRegressor (ridge, lasso, xgb, gbr) and its scaler.
+
+    ``encoder`` is the fitted driver LabelEncoder; its classes are stored
+    alongside so the bundle can encode drivers without unpickling it.
+    """
+    if model.passthrough or list(model.stack_method_) != ["predict"] * len(model.estimators_):
+        raise ValueError("Only stacking on base-model predictions without passthrough can be compiled")
+
+    estimators = model.named_estimators_
+    weights = dict(zip(estimators.keys(), model.final_estimator_.coef_))
+    mean, scale = scaler.mean_, scaler.scale_
+
+    # Linear models on scaled inputs -> one linear term on raw inputs
+    coef_scaled = weights["ridge"] * estimators["ridge"].coef_ + weights["lasso"] * estimators["lasso"].coef_
+    intercept = (
+        model.final_estimator_.intercept_
+        + weights["ridge"] * estimators["ridge"].intercept_
+        + weights["lasso"] * estimators["lasso"].intercept_
+        - coef_scaled @ (mean / scale)
+    )
+
+    gbr = estimators["gbr"]
+    xgb_trees, xgb_base = _xgb_trees(estimators["xgb"], weights["xgb"])
+    intercept += weights["xgb"] * xgb_base
+    intercept += weights["gbr"] * float(gbr.init_.predict(np.zeros((1, len(mean))))[0])
+
+    trees = xgb_trees + _sklearn_trees(gbr, weights["gbr"])
+    depths = np.array([_tree_depth(tree[2], tree[3]) for tree in trees])
+    trees = [trees[i] for i in np.argsort(depths, kind="stable")]
+    depths = np.sort(depths, kind="stable")
+
+    # Concatenate all trees into flat node arrays with global child indices
+    sizes = np.array([len(tree[0]) for tree in trees])
+    roots = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    feature, threshold, left, right, value = (np.concatenate([tree[i] for tree in trees]) for i in range(5))
+    offsets = np.repeat(roots, sizes)
+
+    return CompiledPredictor(
+        mean=mean,
+        scale=scale,
+        coef=coef_scaled / scale,
+        intercept=intercept,
+        feature=feature.astype(np.int64),
+        threshold=threshold.astype(np.float32),
+        children=np.stack([right + offsets, left + offsets], axis=1).ravel().astype(np.int64),
+        value=value,
+        roots=roots.astype(np.int64),
+        depths=depths,
+        source_version=version,
+        driver_classes=encoder.classes_ if encoder is not None else (),
+    )
+
+
+def verify(compiled, model, scaler, X, atol=1e-6):
+    """Max abs difference to the sklearn path; raises if above ``atol``."""
+    expected = model.predict((X - scaler.mean_) / scaler.scale_)
+    error = float(np.max(np.abs(compiled.predict(X) - expected)))
+    if error > atol:
+        raise AssertionError(f"Compiled predictor differs from the stacking model by {error:.3g} (> {atol})")
+    return error
+
+
+def verification_inputs(bundle, n_grids=10_000, seed=0):
+    """Feature matrices to check a predictor on: ``{name: X}``.
+
+    The bundle's training rows, ``n_grids`` random grids of one round and the
+    same grids spread over random rounds.
+    """
+    import pandas as pd
+
+    from .bundle import TRAINING_DATA_FILE
+    from .features import build_feature_matrix, frame_feature_matrix
+
+    training = pd.read_csv(bundle.model_dir / TRAINING_DATA_FILE)
+    training["Abbreviation"] = bundle.encoding.encode(training["Abbreviation"])
+    rng = np.random.default_rng(seed)
+    grids = np.argsort(rng.random((n_grids, len(bundle.driver_codes))), axis=1) + 1
+    one_round, all_rounds = (
+        build_feature_matrix(
+            bundle.feature_columns,
+            Round=rounds,
+            Abbreviation=bundle.driver_codes,
+            GridPosition=grids,
+            **bundle.driver_stats,
+        )
+        for rounds in (5, rng.integers(1, 25, (len(grids), 1)))
+    )
+    return {
+        "training rows": frame_feature_matrix(training, bundle.feature_columns),
+        "grids, one round": one_round,
+        "grids, all rounds": all_rounds,
+    }
+
+
+def main():
+    import joblib
+
+    from .bundle import ENCODER_FILE, MODEL_FILE, SCALER_FILE, load_bundle
+
+    parser = argparse.ArgumentParser(description="Export and verify the compiled predictor.")
+    parser.add_argument("--atol", type=float, default=1e-6)
+    parser.add_argument("--verify-only", action="store_true", help=f"check the saved {COMPILED_FILE}, write nothing")
+    args = parser.parse_args()
+
+    bundle = load_bundle()
+    model, scaler = bundle.model, bundle.scaler
+    if args.verify_only:
+        if bundle.compiled is None:
+            raise SystemExit(f"{MODEL_DIR / COMPILED_FILE} is missing or was exported from other artifacts")
+        compiled = bundle.compiled
+    else:
+        encoder = joblib.load(MODEL_DIR / ENCODER_FILE)
+        compiled = export_compiled(
+            joblib.load(MODEL_DIR / MODEL_FILE), joblib.load(MODEL_DIR / SCALER_FILE),
+            version=source_version(), encoder=encoder,
+        )
+
+    inputs = verification_inputs(bundle)
+    for label, X in inputs.items():
+        print(f"max |diff| {label + ':':<19} {verify(compiled, model, scaler, X, args.atol):.2e}")
+
+    workloads = (
+        ("single grid", inputs["grids, one round"][:20], 200),
+        ("10k grids, one round", inputs["grids, one round"], 1),
+        ("10k grids, all rounds", inputs["grids, all rounds"], 1),
+    )
+    for label, X, repeat in workloads:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            model.predict((X - scaler.mean_) / scaler.scale_)
+        sklearn_seconds = (time.perf_counter() - start) / repeat
+        start = time.perf_counter()
+        for _ in range(repeat):
+            compiled.predict(X)
+        compiled_seconds = (time.perf_counter() - start) / repeat
+        print(
+            f"{label:<22} sklearn {sklearn_seconds * 1e3:8.2f} ms   compiled {compiled_seconds * 1e3:8.2f} ms"
+            f"   ({sklearn_seconds / compiled_seconds:.0f}x)"
+        )
+
+    if not args.verify_only:
+        compiled.save(MODEL_DIR / COMPILED_FILE)
+        print(f"Saved {MODEL_DIR / COMPILED_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Driver abbreviation encoding used as the ``Abbreviation`` model feature.
+
+The LabelEncoder fitted in ``train_model.ipynb`` is persisted as
+``model/driver_encoder.pkl`` so serving uses exactly the codes the model was
+trained with instead of refitting on whatever drivers are on the grid.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class DriverEncoding:
+    """Precomputed abbreviation -> code lookup built from a fitted LabelEncoder."""
+
+    codes: dict
+    # Code for drivers the encoder never saw: the middle of the trained code
+    # range, which keeps the scaled feature close to zero.
+    fallback_code: float
+
+    @classmethod
+    def from_encoder(cls, encoder):
+        return cls.from_classes(encoder.classes_)
+
+    @classmethod
+    def from_classes(cls, classes):
+        """Build from the encoder's ``classes_`` (index = code)."""
+        classes = [str(abbr) for abbr in classes]
+        return cls(
+            codes={abbr: float(code) for code, abbr in enumerate(classes)},
+            fallback_code=(len(classes) - 1) / 2,
+        )
+
+    def encode(self, abbrs):
+        return np.array([self.codes.get(abbr, self.fallback_code) for abbr in abbrs], dtype=np.float64)
+
+    def unknown(self, abbrs):
+        return [abbr for abbr in abbrs if abbr not in self.codes]
@@ -0,0 +1,78 @@
+"""Feature matrix construction shared by training, the app and batch jobs.
+
+Every column is given as an array and broadcast against the others, so one
+call builds the matrix for N drivers x M scenarios without per-driver lookups:
+
+    grid = np.array([[1, 2, ..., 20], [3, 1, ..., 19]])      # (M, N)
+    X = build_feature_matrix(
+        feature_columns,
+        Round=5,                                            # scalar
+        Abbreviation=codes,                                 # (N,)
+        GridPosition=grid,                                  # (M, N)
+        **bundle.driver_stats,                              # (N,) each
+    )                                                       # (M * N, F)
+
+Derived features (``QualifyingScore``) are computed here and nowhere else, so
+the training data and the served features always agree.
+"""
+import numpy as np
+
+# Column order the committed model was trained with (see feature_columns.pkl)
+FEATURE_COLUMNS = [
+    "Round",
+    "Abbreviation",
+    "GridPosition",
+    "Points",
+    "AvgQualiPosition",
+    "AvgRacePosition",
+    "QualifyingScore",
+]
+
+# Per-driver season aggregates taken from the driver table
+DRIVER_STAT_COLUMNS = ["Points", "AvgQualiPosition", "AvgRacePosition"]
+
+
+def qualifying_score(avg_quali_position, grid_position):
+    return (avg_quali_position + grid_position) / 2
+
+
+DERIVED_FEATURES = {
+    "QualifyingScore": lambda c: qualifying_score(c["AvgQualiPosition"], c["GridPosition"]),
+}
+
+
+def position_tier(position):
+    """Training target: 0 = top five, 1 = P6-P10, 2 = backmarker."""
+    return np.select([np.asarray(position) <= 5, np.asarray(position) <= 10], [0, 1], 2)
+
+
+def driver_stats(drivers):
+    """Driver table -> ``{column: float array}`` in the table's row order."""
+    return {column: drivers[column].to_numpy(dtype=np.float64) for column in DRIVER_STAT_COLUMNS}
+
+
+def build_feature_matrix(feature_columns, **columns):
+    """Broadcast ``columns`` together and return a C-contiguous ``(rows, F)`` array.
+
+    ``columns`` holds the base features as scalars or arrays; missing derived
+    features are computed from them. Rows follow the broadcast shape in C
+    order, i.e. scenario-major when the grid is ``(M, N)``.
+    """
+    columns = {name: np.asarray(value, dtype=np.float64) for name, value in columns.items()}
+    for name in feature_columns:
+        if name not in columns:
+            if name not in DERIVED_FEATURES:
+                raise KeyError(f"No value or derivation for feature column {name!r}")
+            columns[name] = DERIVED_FEATURES[name](columns)
+
+    shape = np.broadcast_shapes(*(columns[name].shape for name in feature_columns))
+    matrix = np.empty(shape + (len(feature_columns),), dtype=np.float64)
+    for j, name in enumerate(feature_columns):
+        matrix[..., j] = columns[name]
+    return matrix.reshape(-1, len(feature_columns))
+
+
+def frame_feature_matrix(df, feature_columns):
+    """Feature matrix for a results-shaped DataFrame (one row per driver result)."""
+    base = [name for name in feature_columns if name not in DERIVED_FEATURES]
+    return build_feature_matrix(feature_columns, **{name: df[name].to_numpy() for name in base})
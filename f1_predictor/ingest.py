@@ -0,0 +1,157 @@
+"""Parallel, incremental ingestion of FastF1 race results.
+
+Each (season, round) race session is loaded in a worker process with laps,
+telemetry, weather and messages switched off, and written to the results
+store (``store.py``) as its own partition. The store's manifest records which
+sessions are already ingested, so a refresh only loads rounds that are new:
+
+    python -m f1_predictor.ingest 2024 2025 --workers 8
+
+A season without a schedule snapshot has it fetched from FastF1 first. A
+session that fails to load does not stop the others: every successful session
+is still written, and the failures are reported together at the end.
+"""
+import argparse
+import datetime
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .paths import FASTF1_CACHE_DIR
+from .schedule import get_schedule, refresh_schedule, snapshot_path
+from .store import import_legacy_csv, read_manifest, write_sessions
+
+
+class IngestError(RuntimeError):
+    """Some sessions failed to load; the ones in ``ingested`` were still written."""
+
+    def __init__(self, ingested, failures):
+        self.ingested = ingested
+        self.failures = failures  # (season, round) -> exception
+        super().__init__(
+            "Failed to ingest: "
+            + ", ".join(f"{season} R{rnd} ({error!r})" for (season, rnd), error in sorted(failures.items()))
+        )
+
+
+def _load_session_results(season, round_number, cache_dir):
+    """Worker: load one race's classification from FastF1 (results only)."""
+    import fastf1
+
+    fastf1.Cache.enable_cache(cache_dir)
+    session = fastf1.get_session(season, round_number, "R")
+    session.load(laps=False, telemetry=False, weather=False, messages=False)
+
+    return pd.DataFrame(session.results)
+
+
+def qualifying_order(season, round_number, cache_dir=FASTF1_CACHE_DIR):
+    """Driver abbreviations in qualifying classification order, from FastF1.
+
+    Loads the qualifying session results only (no laps or telemetry). Drivers
+    without a classified position are placed last.
+    """
+    import fastf1
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fastf1.Cache.enable_cache(str(cache_dir))
+    session = fastf1.get_session(season, round_number, "Q")
+    session.load(laps=False, telemetry=False, weather=False, messages=False)
+
+    results = pd.DataFrame(session.results)
+    return results.sort_values("Position", na_position="last")["Abbreviation"].tolist()
+
+
+def completed_rounds(season, today=None):
+    """Rounds of ``season`` whose race date has passed, from the schedule snapshot.
+
+    The snapshot is fetched from FastF1 first if the season has none yet.
+    """
+    today = today or datetime.date.today()
+    schedule = get_schedule(season) if snapshot_path(season).exists() else refresh_schedule(season)
+    return [
+        rnd
+        for rnd, date in zip(schedule.event_rounds, schedule.event_dates)
+        if datetime.date.fromisoformat(date) < today
+    ]
+
+
+def ingest(sessions, workers=None, cache_dir=FASTF1_CACHE_DIR):
+    """Load every ``(season, round)`` in ``sessions`` not yet in the store.
+
+    Returns the list of newly ingested sessions. Each session is written and
+    recorded in the manifest as soon as its worker finishes, so an interrupted
+    run keeps the rounds it already completed. If any session fails to load,
+    the rest are still written and ``IngestError`` is raised at the end.
+    """
+    manifest = read_manifest()
+    pending = sorted(set(sessions) - set(manifest))
+    if not pending:
+        return []
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    ingested = []
+    failures = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_load_session_results, season, rnd, str(cache_dir)): (season, rnd)
+            for season, rnd in pending
+        }
+        for future in as_completed(futures):
+            session = futures[future]
+            try:
+                results = future.result()
+            except Exception as error:
+                failures[session] = error
+                continue
+            write_sessions({session: results})
+            ingested.append(session)
+
+    if failures:
+        raise IngestError(sorted(ingested), failures)
+    return sorted(ingested)
+
+
+def ingest_seasons(seasons, workers=None, cache_dir=FASTF1_CACHE_DIR):
+    """Ingest every completed round of ``seasons``."""
+    sessions = [(season, rnd) for season in seasons for rnd in completed_rounds(season)]
+    return ingest(sessions, workers=workers, cache_dir=cache_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest new FastF1 race results into the results store.")
+    parser.add_argument("seasons", type=int, nargs="*")
+    parser.add_argument("--rounds", type=int, nargs="+", help="only these rounds (default: every completed round)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--import-legacy", action="store_true", help="seed the store from f1_results_2024_2025.csv")
+    args = parser.parse_args()
+
+    if args.import_legacy:
+        import_legacy_csv()
+    if not args.seasons:
+        return
+
+    try:
+        if args.rounds:
+            sessions = [(season, rnd) for season in args.seasons for rnd in args.rounds]
+            ingested = ingest(sessions, workers=args.workers)
+        else:
+            ingested = ingest_seasons(args.seasons, workers=args.workers)
+    except IngestError as error:
+        ingested = error.ingested
+        failure = str(error)
+    else:
+        failure = None
+
+    if ingested:
+        print("Ingested: " + ", ".join(f"{season} R{rnd}" for season, rnd in ingested))
+    elif failure is None:
+        print("Results store is up to date.")
+    if failure:
+        sys.exit(failure)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Process-wide counters and stage timings, shared by every session of the running app.
+
+* ``inc`` bumps a counter; ``span`` times a block into a per-stage histogram.
+* ``render_prometheus`` formats both in the Prometheus text exposition format,
+  served by ``start_http_server`` (Streamlit) or the API's ``/metrics`` route.
+* ``profile`` dumps a cProfile of a block when profiling is enabled for the
+  process (``F1_PROFILING=1``) and requested for that call; otherwise it is a
+  no-op context manager.
+"""
+import cProfile
+import contextlib
+import os
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .paths import ROOT_DIR
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+SPAN_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SPAN_METRIC = "f1_stage_duration_seconds"
+
+# Local metrics endpoint for the Streamlit process; 0 disables it
+METRICS_PORT = int(os.environ.get("F1_METRICS_PORT", "9108"))
+PROFILING_ENABLED = os.environ.get("F1_PROFILING") == "1"
+PROFILE_DIR = ROOT_DIR / "profiles"
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+# stage -> [bucket counts..., count, sum]
+_spans = {}
+_server = None
+
+
+def inc(name, value=1):
+    with _lock:
+        _counters[name] += value
+
+
+def counters():
+    """Snapshot of all counters as ``{name: value}``."""
+    with _lock:
+        return dict(_counters)
+
+
+def observe(stage, seconds):
+    with _lock:
+        stats = _spans.get(stage)
+        if stats is None:
+            stats = _spans[stage] = [0] * len(SPAN_BUCKETS) + [0, 0.0]
+        for i, bound in enumerate(SPAN_BUCKETS):
+            if seconds <= bound:
+                stats[i] += 1
+        stats[-2] += 1
+        stats[-1] += seconds
+
+
+@contextlib.contextmanager
+def span(stage):
+    """Time the enclosed block as ``stage``; also usable as a function decorator."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+def spans():
+    """Snapshot of stage timings as ``{stage: (count, total seconds)}``."""
+    with _lock:
+        return {stage: (stats[-2], stats[-1]) for stage, stats in _spans.items()}
+
+
+def render_prometheus():
+    with _lock:
+        counter_items = sorted(_counters.items())
+        span_items = sorted((stage, list(stats)) for stage, stats in _spans.items())
+
+    lines = []
+    for name, value in counter_items:
+        lines += [f"# TYPE f1_{name} counter", f"f1_{name} {value}"]
+    if span_items:
+        lines.append(f"# TYPE {SPAN_METRIC} histogram")
+    for stage, stats in span_items:
+        for bound, count in zip(SPAN_BUCKETS, stats):
+            lines.append(f'{SPAN_METRIC}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+        lines += [
+            f'{SPAN_METRIC}_bucket{{stage="{stage}",le="+Inf"}} {stats[-2]}',
+            f'{SPAN_METRIC}_count{{stage="{stage}"}} {stats[-2]}',
+            f'{SPAN_METRIC}_sum{{stage="{stage}"}} {stats[-1]}',
+        ]
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port=METRICS_PORT, host="127.0.0.1"):
+    """Serve ``/metrics`` from a daemon thread, once per process.
+
+    Returns the bound port, or ``None`` when disabled or the port is taken
+    (e.g. by another server process on the same host).
+    """
+    global _server
+    with _lock:
+        if _server is None and port:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError:
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        return _server.server_address[1] if _server is not None else None
+
+
+@contextlib.contextmanager
+def profile(name, requested=False):
+    """cProfile the block into ``profiles/<name>-<timestamp>.prof`` when enabled and requested."""
+    if not (PROFILING_ENABLED and requested):
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        PROFILE_DIR.mkdir(exist_ok=True)
+        profiler.dump_stats(PROFILE_DIR / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof")
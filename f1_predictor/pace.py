@@ -0,0 +1,249 @@
+"""Per-driver pace features from FastF1 lap tables.
+
+For every race in the results store this derives, per driver:
+
+* ``LongRunPace``: mean fuel-corrected clean race lap, in seconds;
+* ``LongRunDelta``: that pace relative to the fastest driver, in percent;
+* ``TyreDegradation``: lap-time loss per lap of tyre age (s/lap), fitted per
+  stint and averaged over the driver's stints;
+* ``QualiRaceDelta``: mean clean race lap relative to the driver's best
+  qualifying lap, in percent.
+
+Sessions are processed one at a time: the race and qualifying lap tables are
+loaded (no telemetry, weather or car data), reduced to a handful of NumPy
+arrays, turned into a ~20-row feature frame with grouped ``bincount``
+reductions, and released before the next session. Each session's features are
+cached as ``pace/Season=YYYY/Round=R.parquet``, so a refresh after a race
+weekend only loads that race:
+
+    python -m f1_predictor.pace 2024 2025
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from .paths import DATA_DIR, FASTF1_CACHE_DIR
+from .store import read_manifest
+
+PACE_DIR = DATA_DIR / "pace"
+
+PACE_COLUMNS = ["LongRunPace", "LongRunDelta", "TyreDegradation", "QualiRaceDelta", "CleanLaps"]
+LAP_COLUMNS = [
+    "Driver", "LapNumber", "LapTime", "Stint", "TyreLife", "PitInTime", "PitOutTime", "TrackStatus", "IsAccurate",
+]
+
+# Lap time gained per lap as fuel burns off; added back to compare laps at equal fuel
+FUEL_SECONDS_PER_LAP = 0.03
+# Laps slower than this multiple of the session's fastest clean lap are traffic/SC laps
+SLOW_LAP_FACTOR = 1.07
+# Minimum clean laps for a driver's pace, and per stint for a degradation fit
+MIN_CLEAN_LAPS = 5
+MIN_STINT_LAPS = 5
+
+
+def pace_path(season, round_number):
+    return PACE_DIR / f"Season={season}" / f"Round={round_number}.parquet"
+
+
+def _load_laps(season, round_number, session_code, cache_dir):
+    """Lap table of one session, reduced to ``LAP_COLUMNS``."""
+    import fastf1
+
+    fastf1.Cache.enable_cache(str(cache_dir))
+    session = fastf1.get_session(season, round_number, session_code)
+    # Race control messages mark deleted qualifying laps; not needed for the race
+    session.load(laps=True, telemetry=False, weather=False, messages=session_code == "Q")
+    laps = pd.DataFrame(session.laps)
+    if "Deleted" in laps:
+        laps = laps[laps["Deleted"] != True]  # noqa: E712 (None when messages are missing)
+    return laps[LAP_COLUMNS].reset_index(drop=True)
+
+
+def _seconds(timedeltas):
+    return pd.to_timedelta(timedeltas).dt.total_seconds().to_numpy()
+
+
+def _group_mean(codes, values, n_groups):
+    counts = np.bincount(codes, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.bincount(codes, weights=values, minlength=n_groups) / counts, counts
+
+
+def race_pace(laps):
+    """Per-driver long-run pace and tyre degradation from a race lap table.
+
+    Returns a frame indexed by driver abbreviation. A lap is clean when it is
+    timed accurately under green flags, is not an in/out lap or the opening
+    lap, and is within ``SLOW_LAP_FACTOR`` of the session's fastest clean lap.
+    """
+    drivers, abbrs = pd.factorize(laps["Driver"])
+    lap_time = _seconds(laps["LapTime"])
+    lap_number = laps["LapNumber"].to_numpy(dtype=np.float64)
+    tyre_life = laps["TyreLife"].to_numpy(dtype=np.float64)
+    stint = laps["Stint"].fillna(0).to_numpy(dtype=np.int64)
+
+    clean = (
+        np.isfinite(lap_time)
+        & np.isfinite(tyre_life)
+        & laps["IsAccurate"].fillna(False).to_numpy(dtype=bool)
+        & laps["PitInTime"].isna().to_numpy()
+        & laps["PitOutTime"].isna().to_numpy()
+        & (laps["TrackStatus"].astype(str).to_numpy() == "1")
+        & (lap_number > 1)
+    )
+    if clean.any():
+        clean &= lap_time <= SLOW_LAP_FACTOR * lap_time[clean].min()
+
+    n_drivers = len(abbrs)
+    if not clean.any():
+        # Whole race behind the safety car, no accurate timing or no lap data at all
+        nan = np.full(n_drivers, np.nan)
+        return pd.DataFrame(
+            {"LongRunPace": nan, "LongRunDelta": nan, "TyreDegradation": nan, "RacePace": nan,
+             "CleanLaps": np.zeros(n_drivers, dtype=np.int64)},
+            index=pd.Index(abbrs, name="Abbreviation"),
+        )
+
+    drivers, lap_time, lap_number, tyre_life, stint = (
+        a[clean] for a in (drivers, lap_time, lap_number, tyre_life, stint)
+    )
+    corrected = lap_time + FUEL_SECONDS_PER_LAP * (lap_number - 1)
+
+    raw_pace, clean_laps = _group_mean(drivers, lap_time, n_drivers)
+    long_run, _ = _group_mean(drivers, corrected, n_drivers)
+    enough = clean_laps >= MIN_CLEAN_LAPS
+    long_run[~enough] = np.nan
+    raw_pace[~enough] = np.nan
+
+    # Least-squares slope of corrected lap time on tyre age, per (driver, stint)
+    stints, stint_driver = pd.factorize(pd.MultiIndex.from_arrays([drivers, stint]))
+    n_stints = len(stint_driver)
+    sums = [np.bincount(stints, weights=w, minlength=n_stints)
+            for w in (None, tyre_life, corrected, tyre_life * tyre_life, tyre_life * corrected)]
+    n, sx, sy, sxx, sxy = sums
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+    fitted = (n >= MIN_STINT_LAPS) & np.isfinite(slope)
+
+    stint_owner = stint_driver.get_level_values(0).to_numpy(dtype=np.int64)
+    weights = np.where(fitted, n, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        degradation = (
+            np.bincount(stint_owner, weights=np.where(fitted, slope * n, 0), minlength=n_drivers)
+            / np.bincount(stint_owner, weights=weights, minlength=n_drivers)
+        )
+
+    return pd.DataFrame(
+        {
+            "LongRunPace": long_run,
+            "LongRunDelta": (long_run / np.nanmin(long_run) - 1) * 100 if enough.any() else np.nan,
+            "TyreDegradation": degradation,
+            "RacePace": raw_pace,
+            "CleanLaps": clean_laps,
+        },
+        index=pd.Index(abbrs, name="Abbreviation"),
+    )
+
+
+def best_quali_laps(laps):
+    """Each driver's fastest accurately timed qualifying lap, in seconds."""
+    lap_time = _seconds(laps["LapTime"])
+    valid = np.isfinite(lap_time) & laps["IsAccurate"].fillna(False).to_numpy(dtype=bool)
+    drivers, abbrs = pd.factorize(laps["Driver"][valid])
+    best = np.full(len(abbrs), np.inf)
+    np.minimum.at(best, drivers, lap_time[valid])
+    return pd.Series(best, index=pd.Index(abbrs, name="Abbreviation"), name="BestQualiLap")
+
+
+def session_pace(race_laps, quali_laps=None):
+    """Pace features of one race weekend, one row per driver."""
+    pace = race_pace(race_laps)
+    if quali_laps is not None and len(quali_laps):
+        best = best_quali_laps(quali_laps).reindex(pace.index)
+        pace["QualiRaceDelta"] = (pace["RacePace"] / best - 1) * 100
+    else:
+        pace["QualiRaceDelta"] = np.nan
+    return pace[PACE_COLUMNS].reset_index()
+
+
+def compute_session(season, round_number, cache_dir=FASTF1_CACHE_DIR):
+    """Load one weekend's race and qualifying laps and cache its pace features."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    race_laps = _load_laps(season, round_number, "R", cache_dir)
+    try:
+        quali_laps = _load_laps(season, round_number, "Q", cache_dir)
+    except Exception:
+        # Qualifying data missing upstream: keep the race-only features
+        quali_laps = None
+    pace = session_pace(race_laps, quali_laps)
+    del race_laps, quali_laps
+
+    path = pace_path(season, round_number)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".parquet.tmp")
+    pace.to_parquet(tmp_path, index=False)
+    tmp_path.replace(path)
+    return pace
+
+
+def iter_pace(sessions, force=False, cache_dir=FASTF1_CACHE_DIR):
+    """Yield ``(season, round, pace frame)``, computing only uncached sessions."""
+    for season, round_number in sessions:
+        path = pace_path(season, round_number)
+        if path.exists() and not force:
+            pace = pd.read_parquet(path)
+        else:
+            pace = compute_session(season, round_number, cache_dir)
+        yield season, round_number, pace
+
+
+def update_pace(seasons=None, force=False, cache_dir=FASTF1_CACHE_DIR):
+    """Compute pace for every stored race (of ``seasons``) not cached yet; returns those sessions."""
+    sessions = sorted(key for key in read_manifest() if seasons is None or key[0] in seasons)
+    pending = [key for key in sessions if force or not pace_path(*key).exists()]
+    for _ in iter_pace(pending, force=force, cache_dir=cache_dir):
+        pass
+    return pending
+
+
+def load_pace(seasons=None):
+    """Cached pace features of all computed sessions, with ``Season``/``Round`` columns."""
+    frames = []
+    for path in sorted(PACE_DIR.glob("Season=*/Round=*.parquet")):
+        season = int(path.parent.name.split("=")[1])
+        if seasons is not None and season not in seasons:
+            continue
+        pace = pd.read_parquet(path)
+        pace.insert(0, "Season", season)
+        pace.insert(1, "Round", int(path.stem.split("=")[1]))
+        frames.append(pace)
+    if not frames:
+        return pd.DataFrame(columns=["Season", "Round", "Abbreviation", *PACE_COLUMNS])
+    return pd.concat(frames, ignore_index=True).sort_values(["Season", "Round"], ignore_index=True)
+
+
+def driver_pace(pace):
+    """Per-driver means of the session features (NaN sessions skipped)."""
+    return pace.groupby("Abbreviation", observed=True)[PACE_COLUMNS[:-1]].mean().reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute lap-based pace features for stored races.")
+    parser.add_argument("seasons", type=int, nargs="*", help="default: every season in the results store")
+    parser.add_argument("--force", action="store_true", help="recompute cached sessions")
+    parser.add_argument("--out", help="write the per-driver pace table to this CSV")
+    args = parser.parse_args()
+
+    computed = update_pace(args.seasons or None, force=args.force)
+    if computed:
+        print("Computed: " + ", ".join(f"{season} R{rnd}" for season, rnd in computed))
+    else:
+        print("Pace features are up to date.")
+
+    if args.out:
+        driver_pace(load_pace(args.seasons or None)).to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
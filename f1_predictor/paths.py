@@ -0,0 +1,8 @@
+"""Filesystem locations shared by the app, notebooks and scripts."""
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+MODEL_DIR = ROOT_DIR / "model"
+DATA_DIR = MODEL_DIR / "DATA"
+# FastF1 HTTP cache, same directory the notebooks enable
+FASTF1_CACHE_DIR = ROOT_DIR / "cache"
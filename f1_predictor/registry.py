@@ -0,0 +1,158 @@
+"""Registry of servable models, one artifact set per season or variant.
+
+``model/registry.json`` lists the models the app and API can serve:
+
+    {
+      "default": "2024",
+      "models": [
+        {"id": "2024", "season": 2024, "title": "F1 Race Predictor 2024",
+         "label": "Stacking ensemble", "path": "."}
+      ]
+    }
+
+``path`` is a directory (relative to ``model/``) holding a full artifact set:
+model, scaler, feature columns, encoder, ``DATA/filtered_drivers_info.csv``
+and optionally ``compiled_model.npz`` and ``team_colors.json``.
+
+To swap in a retrained model without restarting the server, write the new
+artifacts (plus the season's driver table) to a fresh directory and point the
+entry at it (``training --publish`` does both):
+
+    python -m f1_predictor.training --out-dir model/2025-v2
+    python -m f1_predictor.registry publish 2025 2025-v2 --season 2025 --title "F1 Race Predictor 2025"
+
+The registry file is replaced atomically and re-read when it changes, so each
+request sees either the old artifact set or the new one, never a mix.
+"""
+import argparse
+import json
+import threading
+from dataclasses import asdict, dataclass
+
+from .bundle import ARTIFACT_FILES, load_bundle
+from .paths import MODEL_DIR
+
+REGISTRY_FILE = MODEL_DIR / "registry.json"
+
+
+@dataclass(frozen=True)
+class ModelEntry:
+    id: str
+    season: int
+    title: str
+    label: str
+    path: str  # artifact directory, relative to the registry file
+
+    def model_dir(self, registry_file=REGISTRY_FILE):
+        return (registry_file.parent / self.path).resolve()
+
+
+@dataclass(frozen=True)
+class Registry:
+    entries: dict  # id -> ModelEntry, in file order
+    default: str
+
+    def seasons(self):
+        return sorted({entry.season for entry in self.entries.values()}, reverse=True)
+
+    def for_season(self, season):
+        return [entry for entry in self.entries.values() if entry.season == season]
+
+    def get(self, model_id=None):
+        """Entry for ``model_id`` (the default model when ``None``); ``KeyError`` if unknown."""
+        model_id = self.default if model_id is None else model_id
+        if model_id not in self.entries:
+            raise KeyError(f"Unknown model {model_id!r}; registered: {', '.join(self.entries)}")
+        return self.entries[model_id]
+
+
+# Serves the committed artifacts when there is no registry file
+_FALLBACK = Registry(
+    entries={"2024": ModelEntry(id="2024", season=2024, title="F1 Race Predictor 2024", label="Stacking ensemble", path=".")},
+    default="2024",
+)
+
+_lock = threading.Lock()
+# registry file -> ((mtime_ns, size), Registry)
+_registries = {}
+
+
+def _parse(data):
+    entries = {item["id"]: ModelEntry(**item) for item in data["models"]}
+    default = data.get("default") or next(iter(entries))
+    if default not in entries:
+        raise ValueError(f"Default model {default!r} is not registered")
+    return Registry(entries=entries, default=default)
+
+
+def read_registry(registry_file=REGISTRY_FILE):
+    """The current registry, re-read only when the file's mtime or size changes."""
+    if not registry_file.exists():
+        return _FALLBACK
+    stat = registry_file.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _lock:
+        cached = _registries.get(registry_file)
+        if cached is None or cached[0] != stamp:
+            cached = _registries[registry_file] = (stamp, _parse(json.loads(registry_file.read_text(encoding="utf-8"))))
+        return cached[1]
+
+
+def get_bundle(model_id=None, registry_file=REGISTRY_FILE):
+    """``(entry, bundle)`` for a registered model, loaded through the bounded bundle LRU."""
+    entry = read_registry(registry_file).get(model_id)
+    return entry, load_bundle(entry.model_dir(registry_file))
+
+
+def publish(entry, make_default=False, registry_file=REGISTRY_FILE):
+    """Add or replace ``entry`` and atomically rewrite the registry file."""
+    model_dir = entry.model_dir(registry_file)
+    missing = [name for name in ARTIFACT_FILES if not (model_dir / name).exists()]
+    if missing:
+        raise FileNotFoundError(f"Missing artifacts in {model_dir}: {', '.join(missing)}")
+
+    registry = read_registry(registry_file)
+    entries = dict(registry.entries)
+    entries[entry.id] = entry
+    data = {
+        "default": entry.id if make_default else registry.default,
+        "models": [asdict(item) for item in entries.values()],
+    }
+    tmp_path = registry_file.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    tmp_path.replace(registry_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or publish registered models.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list")
+    publish_parser = commands.add_parser("publish", help="register an artifact directory (relative to model/)")
+    publish_parser.add_argument("id")
+    publish_parser.add_argument("path")
+    publish_parser.add_argument("--season", type=int, required=True)
+    publish_parser.add_argument("--title", help="default: 'F1 Race Predictor <season>'")
+    publish_parser.add_argument("--label", default="Stacking ensemble")
+    publish_parser.add_argument("--default", action="store_true", help="make this the default model")
+    args = parser.parse_args()
+
+    if args.command == "publish":
+        entry = ModelEntry(
+            id=args.id,
+            season=args.season,
+            title=args.title or f"F1 Race Predictor {args.season}",
+            label=args.label,
+            path=args.path,
+        )
+        publish(entry, make_default=args.default)
+        print(f"Published {entry.id} -> {entry.model_dir()}")
+
+    registry = read_registry()
+    for entry in registry.entries.values():
+        marker = "*" if entry.id == registry.default else " "
+        print(f"{marker} {entry.id:<12} {entry.season}  {entry.label:<24} {entry.path}")
+
+
+if __name__ == "__main__":
+    main()
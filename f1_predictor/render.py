@@ -0,0 +1,192 @@
+"""Results board rendering for the Streamlit app.
+
+The board (podium, classification and race statistics) is produced as one
+HTML string in a single pass over the results, so Streamlit sends it to the
+browser as one element. The position chart is a single Plotly trace on a
+layout built once per process.
+"""
+import copy
+from functools import lru_cache
+from html import escape
+
+import numpy as np
+
+from . import metrics
+
+DEFAULT_COLOR = "#FFFFFF"
+FONT_FAMILY = "Titillium Web"
+
+PODIUM_EMOJI = ("🥇", "🥈", "🥉")
+
+PODIUM_CARD = (
+    '<div style="flex: 1; background: linear-gradient(135deg, {color}40 0%, {color}20 100%);'
+    ' border: 2px solid {color}; border-radius: 10px; padding: 1.5rem; text-align: center;">'
+    '<div style="font-size: 3rem;">{emoji}</div>'
+    '<div style="font-size: 1.5rem; font-weight: 700; color: white; margin-top: 0.5rem;">{name}</div>'
+    '<div style="font-size: 1rem; color: rgba(255,255,255,0.7); margin-top: 0.3rem;">{abbr}</div>'
+    '<div style="font-size: 1.2rem; color: {color}; font-weight: 700; margin-top: 0.8rem;">{points} PTS</div>'
+    '</div>'
+)
+
+RESULT_ROW = (
+    '<div class="position-row {position_class}" style="border-left-color: {color};">'
+    '<div class="position-number">{position}</div>'
+    '<div class="driver-info">'
+    '<div class="driver-name">{name}</div>'
+    '<div class="driver-abbr">{abbr}</div>'
+    '</div>'
+    '<div class="grid-pos">Grid: P{grid}</div>'
+    '{points_badge}'
+    '<div style="margin-left: 1rem; width: 100px;">'
+    '<div style="color: rgba(255,255,255,0.6); font-size: 0.8rem;">Confidence</div>'
+    '<div style="color: white; font-weight: 700;">{confidence}%</div>'
+    '<div class="confidence-bar"><div class="confidence-fill" style="width: {confidence}%;"></div></div>'
+    '</div>'
+    '</div>'
+)
+
+STAT_CARD = (
+    '<div class="race-info-card" style="flex: 1;">'
+    '<div class="race-info-label">{label}</div>'
+    '<div class="race-info-value">{value}</div>'
+    '{detail}'
+    '</div>'
+)
+
+FLEX_ROW = '<div style="display: flex; gap: 1rem; margin: 1rem 0;">{}</div>'
+
+
+def _board_columns(results, driver_names, team_colors):
+    """Per-row display values as plain arrays, ordered by finishing position."""
+    abbrs = results["Abbreviation"].to_numpy()
+    return {
+        "position": results.index.to_numpy(),
+        "abbr": [escape(abbr) for abbr in abbrs],
+        "name": [escape(driver_names.get(abbr, abbr)) for abbr in abbrs],
+        "color": [team_colors.get(abbr, DEFAULT_COLOR) for abbr in abbrs],
+        "grid": results["GridPosition"].to_numpy().astype(int),
+        "points": results["PredictedPoints"].to_numpy().astype(int),
+        "confidence": results["Confidence"].to_numpy().astype(int),
+    }
+
+
+def _stat_cards(columns, avg_confidence):
+    gained = columns["grid"] - columns["position"]
+    gainer, loser = gained.argmax(), gained.argmin()
+    return "".join([
+        STAT_CARD.format(
+            label="Biggest Gainer", value=columns["abbr"][gainer],
+            detail=f'<div style="color: #00FF00; font-size: 1rem;">↑ {gained[gainer]} positions</div>',
+        ),
+        STAT_CARD.format(
+            label="Biggest Loser", value=columns["abbr"][loser],
+            detail=f'<div style="color: #FF0000; font-size: 1rem;">↓ {-gained[loser]} positions</div>',
+        ),
+        STAT_CARD.format(label="Avg Confidence", value=f"{avg_confidence:.1f}%", detail=""),
+        STAT_CARD.format(label="Total Drivers", value=len(columns["position"]), detail=""),
+    ])
+
+
+@metrics.span("render_board")
+def results_board_html(results, driver_names, team_colors):
+    """Podium, full classification and race statistics as one HTML string.
+
+    ``results`` is a ``service.RacePrediction.results`` frame (indexed by
+    predicted position).
+    """
+    columns = _board_columns(results, driver_names, team_colors)
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    podium = "".join(
+        PODIUM_CARD.format(emoji=emoji, **row) for emoji, row in zip(PODIUM_EMOJI, rows)
+    )
+    classification = "".join(
+        RESULT_ROW.format(
+            position_class=f"position-{row['position']}" if row["position"] <= 3 else "",
+            points_badge=f'<div class="points-badge">{row["points"]} PTS</div>' if row["points"] > 0 else "",
+            **row,
+        )
+        for row in rows
+    )
+
+    return "".join([
+        '<div class="section-header">🏆 Predicted Race Results</div>',
+        "<h3>🥇 Podium</h3>",
+        FLEX_ROW.format(podium),
+        "<hr>",
+        f'<div class="results-table">{classification}</div>',
+        '<div class="section-header">📈 Race Statistics</div>',
+        FLEX_ROW.format(_stat_cards(columns, results["Confidence"].mean())),
+    ])
+
+
+@lru_cache(maxsize=1)
+def _chart_layout():
+    import plotly.graph_objects as go
+
+    return go.Layout(
+        title="Grid Position → Predicted Finish",
+        xaxis=dict(
+            tickmode="array",
+            tickvals=[0, 1],
+            ticktext=["Grid", "Predicted"],
+            showgrid=False,
+            zeroline=False,
+        ),
+        yaxis=dict(
+            title="Position",
+            autorange="reversed",
+            showgrid=True,
+            gridcolor="rgba(255,255,255,0.1)",
+            zeroline=False,
+        ),
+        showlegend=False,
+        height=700,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="white", family=FONT_FAMILY),
+        hovermode="closest",
+    )
+
+
+@metrics.span("render_chart")
+def position_chart(results, driver_names, team_colors):
+    """Grid -> predicted finish chart: one marker/text trace plus connector shapes.
+
+    Each driver contributes two points (grid, predicted); the coloured
+    connectors are layout shapes, so the figure carries a single trace
+    whatever the field size.
+    """
+    import plotly.graph_objects as go
+
+    abbrs = results["Abbreviation"].to_numpy()
+    grid = results["GridPosition"].to_numpy()
+    finish = results.index.to_numpy()
+    colors = [team_colors.get(abbr, DEFAULT_COLOR) for abbr in abbrs]
+    names = [driver_names.get(abbr, abbr) for abbr in abbrs]
+
+    n = len(abbrs)
+    x = np.tile([0, 1], n)
+    y = np.column_stack([grid, finish]).ravel()
+    customdata = np.repeat(np.column_stack([names, grid.astype(int), finish]), 2, axis=0)
+
+    layout = copy.deepcopy(_chart_layout())
+    layout.shapes = [
+        dict(type="line", x0=0, x1=1, y0=g, y1=f, line=dict(color=c, width=3), layer="below")
+        for g, f, c in zip(grid, finish, colors)
+    ]
+
+    return go.Figure(
+        data=[go.Scatter(
+            x=x,
+            y=y,
+            mode="markers+text",
+            marker=dict(size=12, color=np.repeat(colors, 2)),
+            text=np.repeat(abbrs, 2),
+            textposition=["middle left", "middle right"] * n,
+            textfont=dict(size=10, color=np.repeat(colors, 2), family=FONT_FAMILY),
+            customdata=customdata,
+            hovertemplate="%{customdata[0]}<br>Grid: P%{customdata[1]}<br>Predicted: P%{customdata[2]}<extra></extra>",
+        )],
+        layout=layout,
+    )
@@ -0,0 +1,122 @@
+"""Offline race schedule snapshots.
+
+``fastf1.get_event_schedule`` needs a network round trip, which blocks (or
+fails slowly) before the page renders. The schedule for each season is shipped
+as a small JSON snapshot under ``model/DATA/schedules/`` and memoized in
+process memory; FastF1 is only contacted by ``refresh_schedule``.
+
+    python -m f1_predictor.schedule 2024 --refresh
+"""
+import argparse
+import json
+import threading
+from dataclasses import dataclass
+
+from . import metrics
+from .paths import DATA_DIR, FASTF1_CACHE_DIR
+
+SCHEDULE_DIR = DATA_DIR / "schedules"
+
+
+@dataclass(frozen=True)
+class Schedule:
+    season: int
+    event_names: list
+    event_rounds: list
+    event_dates: list
+
+    @property
+    def race_name_to_round(self):
+        return dict(zip(self.event_names, self.event_rounds))
+
+    @property
+    def round_to_race_name(self):
+        return dict(zip(self.event_rounds, self.event_names))
+
+
+_lock = threading.Lock()
+_schedules = {}
+
+
+def snapshot_path(season):
+    return SCHEDULE_DIR / f"{season}.json"
+
+
+def _from_events(season, events):
+    events = sorted(events, key=lambda event: event["RoundNumber"])
+    return Schedule(
+        season=season,
+        event_names=[event["EventName"] for event in events],
+        event_rounds=[int(event["RoundNumber"]) for event in events],
+        event_dates=[event["EventDate"] for event in events],
+    )
+
+
+def get_schedule(season):
+    """Return the memoized ``Schedule`` for ``season`` from its local snapshot."""
+    schedule = _schedules.get(season)
+    if schedule is not None:
+        return schedule
+
+    with _lock:
+        if season not in _schedules:
+            path = snapshot_path(season)
+            if not path.exists():
+                raise FileNotFoundError(
+                    f"No schedule snapshot for {season} at {path}. "
+                    f"Run `python -m f1_predictor.schedule {season} --refresh` to build it."
+                )
+            with metrics.span("schedule_load"):
+                snapshot = json.loads(path.read_text(encoding="utf-8"))
+                _schedules[season] = _from_events(season, snapshot["events"])
+        return _schedules[season]
+
+
+def available_seasons():
+    return sorted(int(path.stem) for path in SCHEDULE_DIR.glob("*.json"))
+
+
+def refresh_schedule(season):
+    """Fetch ``season`` from FastF1, rewrite its snapshot and update the memo."""
+    import fastf1
+
+    FASTF1_CACHE_DIR.mkdir(exist_ok=True)
+    fastf1.Cache.enable_cache(str(FASTF1_CACHE_DIR))
+
+    schedule = fastf1.get_event_schedule(season, include_testing=False)
+    events = [
+        {
+            "RoundNumber": int(row.RoundNumber),
+            "EventName": row.EventName,
+            "EventDate": row.EventDate.date().isoformat(),
+        }
+        for row in schedule.itertuples()
+    ]
+
+    SCHEDULE_DIR.mkdir(parents=True, exist_ok=True)
+    path = snapshot_path(season)
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(
+        json.dumps({"season": season, "events": events}, indent=2, ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+    tmp_path.replace(path)
+
+    with _lock:
+        _schedules[season] = _from_events(season, events)
+        return _schedules[season]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or refresh a season's schedule snapshot.")
+    parser.add_argument("season", type=int)
+    parser.add_argument("--refresh", action="store_true", help="re-download the schedule from FastF1")
+    args = parser.parse_args()
+
+    schedule = refresh_schedule(args.season) if args.refresh else get_schedule(args.season)
+    for rnd, name, date in zip(schedule.event_rounds, schedule.event_names, schedule.event_dates):
+        print(f"{rnd:>2}  {date}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""F1 championship points."""
+import numpy as np
+
+# Points for a race finish (no fastest-lap point)
+POINTS_SYSTEM = {1: 25, 2: 18, 3: 15, 4: 12, 5: 10, 6: 8, 7: 6, 8: 4, 9: 2, 10: 1}
+
+# Index = finishing position; everything past P10 maps to the trailing 0
+_POINTS_BY_POSITION = np.array([0] + [POINTS_SYSTEM.get(pos, 0) for pos in range(1, len(POINTS_SYSTEM) + 2)])
+
+
+def points_for_positions(positions):
+    """Vectorized ``POINTS_SYSTEM`` lookup for an array of finishing positions."""
+    positions = np.asarray(positions, dtype=np.int64)
+    return _POINTS_BY_POSITION[np.clip(positions, 0, len(_POINTS_BY_POSITION) - 1)]
@@ -0,0 +1,200 @@
+"""Whole-season batch prediction and championship projection.
+
+Every round of a schedule is scored from a grid per round, either supplied as a
+CSV (``Round, Abbreviation, GridPosition``) or synthesized from each driver's
+``AvgQualiPosition``. Rounds are predicted in vectorized chunks and yielded as
+they finish so callers can render or write the first rounds early.
+
+    python -m f1_predictor.season --season 2024 --results rounds.parquet --standings drivers.csv
+"""
+import argparse
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .bundle import load_bundle
+from .features import build_feature_matrix
+from .schedule import get_schedule
+from .scoring import points_for_positions
+
+
+@dataclass
+class RoundPrediction:
+    round_number: int
+    event_name: str
+    results: pd.DataFrame  # one row per driver, ordered by predicted position
+
+
+def average_quali_grid(bundle):
+    """Grid in driver-table order, ranked by average qualifying position."""
+    return bundle.drivers["AvgQualiPosition"].rank(method="first").to_numpy()
+
+
+def load_grids(path, bundle, rounds):
+    """Read a ``Round, Abbreviation, GridPosition`` CSV into a ``(rounds, drivers)`` array.
+
+    Rounds missing from the file use the average qualifying grid. In a round
+    that lists only some drivers, those keep their positions and the others
+    fill the remaining slots in average qualifying order. ``ValueError`` if a
+    round repeats a position or uses one outside ``1..drivers``.
+    """
+    base = average_quali_grid(bundle)
+    grids = np.tile(base, (len(rounds), 1))
+    given = np.zeros(grids.shape, dtype=bool)
+    table = pd.read_csv(path, usecols=["Round", "Abbreviation", "GridPosition"])
+    table = table[table["Round"].isin(rounds) & table["Abbreviation"].isin(bundle.drivers.index)]
+
+    round_index = {rnd: i for i, rnd in enumerate(rounds)}
+    rows = table["Round"].map(round_index).to_numpy()
+    cols = bundle.drivers.index.get_indexer(table["Abbreviation"])
+    grids[rows, cols] = table["GridPosition"].to_numpy()
+    given[rows, cols] = True
+
+    n_drivers = grids.shape[1]
+    for i in np.flatnonzero(given.any(axis=1)):
+        fixed = grids[i, given[i]]
+        if len(np.unique(fixed)) < len(fixed) or not np.isin(fixed, np.arange(1, n_drivers + 1)).all():
+            raise ValueError(
+                f"Round {rounds[i]}: grid positions must be distinct whole numbers from 1 to {n_drivers}"
+            )
+        others = np.flatnonzero(~given[i])
+        others = others[np.argsort(base[others], kind="stable")]
+        grids[i, others] = np.setdiff1d(np.arange(1, n_drivers + 1), fixed)
+    return grids
+
+
+def iter_season(bundle, schedule, grids=None, chunk_rounds=None):
+    """Yield a ``RoundPrediction`` per round of ``schedule``, in round order.
+
+    ``grids`` is a ``(rounds, drivers)`` array aligned with
+    ``schedule.event_rounds`` and the driver table; ``None`` uses the average
+    qualifying grid everywhere. Each chunk of ``chunk_rounds`` rounds (all of
+    them by default) is one feature matrix and one predict call.
+    """
+    rounds = np.asarray(schedule.event_rounds)
+    if grids is None:
+        grids = np.tile(average_quali_grid(bundle), (len(rounds), 1))
+    grids = np.asarray(grids, dtype=np.float64)
+    n_drivers = grids.shape[1]
+    chunk_rounds = chunk_rounds or len(rounds)
+
+    abbrs = np.asarray(bundle.driver_abbrs)
+    teams = bundle.drivers["TeamId"].to_numpy()
+
+    for start in range(0, len(rounds), chunk_rounds):
+        chunk = slice(start, start + chunk_rounds)
+        X = build_feature_matrix(
+            bundle.feature_columns,
+            Round=rounds[chunk, None],
+            Abbreviation=bundle.driver_codes,
+            GridPosition=grids[chunk],
+            **bundle.driver_stats,
+        )
+        scores = bundle.predict(X).reshape(-1, n_drivers)
+        orders = np.argsort(scores, axis=1, kind="stable")
+
+        for offset, order in enumerate(orders):
+            i = start + offset
+            positions = np.arange(1, n_drivers + 1)
+            results = pd.DataFrame({
+                "Round": rounds[i],
+                "Position": positions,
+                "Abbreviation": abbrs[order],
+                "TeamId": teams[order],
+                "GridPosition": grids[i, order].astype(int),
+                "PredictedScore": scores[offset, order],
+                "Points": points_for_positions(positions),
+            })
+            yield RoundPrediction(int(rounds[i]), schedule.event_names[i], results)
+
+
+class SeasonStandings:
+    """Running driver and constructor points totals."""
+
+    def __init__(self, drivers):
+        self.names = drivers["DriverName"]
+        self.teams = drivers["TeamId"]
+        self.points = pd.Series(0, index=drivers.index, dtype=np.int64)
+        self.wins = pd.Series(0, index=drivers.index, dtype=np.int64)
+        self.rounds = 0
+
+    def add(self, prediction):
+        results = prediction.results.set_index("Abbreviation")
+        self.points += results["Points"].reindex(self.points.index, fill_value=0)
+        self.wins.loc[results.index[0]] += 1
+        self.rounds += 1
+
+    def drivers(self):
+        standings = pd.DataFrame({
+            "Abbreviation": self.points.index,
+            "DriverName": self.names.reindex(self.points.index).to_numpy(),
+            "TeamId": self.teams.reindex(self.points.index).to_numpy(),
+            "Points": self.points.to_numpy(),
+            "Wins": self.wins.to_numpy(),
+        })
+        standings = standings.sort_values(["Points", "Wins"], ascending=False).reset_index(drop=True)
+        standings.index += 1
+        return standings
+
+    def constructors(self):
+        standings = (
+            self.drivers()
+            .groupby("TeamId", as_index=False)[["Points", "Wins"]]
+            .sum()
+            .sort_values(["Points", "Wins"], ascending=False)
+            .reset_index(drop=True)
+        )
+        standings.index += 1
+        return standings
+
+
+def write_table(df, path):
+    """Write ``df`` as Parquet or CSV depending on the file suffix."""
+    path = str(path)
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Predict every round of a season and project the standings.")
+    parser.add_argument("--season", type=int, default=2024)
+    parser.add_argument("--grids", help="CSV with Round, Abbreviation, GridPosition (default: average qualifying)")
+    parser.add_argument("--chunk-rounds", type=int, help="rounds scored per predict call (default: all)")
+    parser.add_argument("--results", help="write per-round predictions to this .csv/.parquet file")
+    parser.add_argument("--standings", help="write driver standings to this .csv/.parquet file")
+    parser.add_argument("--constructors", help="write constructor standings to this .csv/.parquet file")
+    args = parser.parse_args()
+
+    bundle = load_bundle()
+    schedule = get_schedule(args.season)
+    try:
+        grids = load_grids(args.grids, bundle, schedule.event_rounds) if args.grids else None
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    standings = SeasonStandings(bundle.drivers)
+    round_results = []
+    for prediction in iter_season(bundle, schedule, grids, args.chunk_rounds):
+        standings.add(prediction)
+        round_results.append(prediction.results)
+        podium = " ".join(prediction.results["Abbreviation"].head(3))
+        print(f"R{prediction.round_number:>2} {prediction.event_name:<28} {podium}", flush=True)
+
+    print()
+    print(standings.drivers().to_string())
+    print()
+    print(standings.constructors().to_string())
+
+    if args.results:
+        write_table(pd.concat(round_results, ignore_index=True), args.results)
+    if args.standings:
+        write_table(standings.drivers(), args.standings)
+    if args.constructors:
+        write_table(standings.constructors(), args.constructors)
+
+
+if __name__ == "__main__":
+    main()
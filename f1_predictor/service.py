@@ -0,0 +1,160 @@
+"""Prediction service: grid in, classified race out.
+
+This is the pipeline the app, the HTTP API and scripts share: validate the
+grid, build features, score with the bundle, sort, and assign points. Scores
+go through the process-wide prediction cache, and a batch of grids that miss
+the cache is scored with a single feature matrix and predict call. The whole
+batch is then classified on its ``(races, drivers)`` score array; results stay
+NumPy arrays until a caller asks for a frame or JSON.
+"""
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from . import metrics
+from .cache import prediction_cache
+from .features import build_feature_matrix
+from .scoring import points_for_positions
+
+
+class GridError(ValueError):
+    """The submitted grid cannot be scored (wrong size, duplicates, unknown drivers)."""
+
+
+@dataclass
+class RacePrediction:
+    round_number: int
+    grid: tuple  # driver abbreviations from P1 onwards
+    # Per-driver arrays in predicted finishing order (P1 first)
+    abbreviations: np.ndarray
+    grid_positions: np.ndarray
+    scores: np.ndarray  # model score (predicted position tier)
+    confidence: np.ndarray
+    points: np.ndarray
+
+    @cached_property
+    def results(self):
+        """The classification as a frame indexed by predicted position (1-based).
+
+        Columns Abbreviation, GridPosition, PredictedPosition (model score),
+        Confidence, PredictedPoints; built on first access only, for the
+        Streamlit board.
+        """
+        return pd.DataFrame(
+            {
+                "Abbreviation": self.abbreviations,
+                "GridPosition": self.grid_positions,
+                "PredictedPosition": self.scores,
+                "Confidence": self.confidence,
+                "PredictedPoints": self.points,
+            },
+            index=pd.RangeIndex(1, len(self.abbreviations) + 1),
+        )
+
+    def to_dict(self, driver_names=None):
+        driver_names = driver_names or {}
+        abbrs = self.abbreviations.tolist()
+        return {
+            "round": self.round_number,
+            "grid": list(self.grid),
+            "results": [
+                {
+                    "position": position,
+                    "abbreviation": abbr,
+                    "driver_name": driver_names.get(abbr, ""),
+                    "grid_position": grid_position,
+                    "score": score,
+                    "confidence": confidence,
+                    "points": points,
+                }
+                for position, abbr, grid_position, score, confidence, points in zip(
+                    range(1, len(abbrs) + 1),
+                    abbrs,
+                    self.grid_positions.astype(int).tolist(),
+                    self.scores.tolist(),
+                    self.confidence.tolist(),
+                    self.points.tolist(),
+                )
+            ],
+        }
+
+
+def grid_positions(bundle, grid):
+    """Grid as ``[P1 abbr, P2 abbr, ...]`` -> grid positions in driver-table order."""
+    grid = tuple(grid)
+    rows = bundle.driver_rows
+    if len(grid) != len(rows):
+        raise GridError(f"Grid must list all {len(rows)} drivers, got {len(grid)}")
+    if len(set(grid)) != len(grid):
+        raise GridError("Grid lists the same driver more than once")
+    unknown = [abbr for abbr in grid if abbr not in rows]
+    if unknown:
+        raise GridError(f"Unknown drivers: {', '.join(unknown)}")
+
+    positions = np.empty(len(grid), dtype=np.float64)
+    positions[[rows[abbr] for abbr in grid]] = np.arange(1, len(grid) + 1)
+    return positions
+
+
+@metrics.span("classify")
+def _classify(bundle, grids, scores):
+    """Sort a batch of races at once: ``(races, drivers)`` grid positions and scores
+    in driver-table order -> the same per-driver arrays in predicted finishing order.
+    """
+    order = np.argsort(scores, axis=1, kind="stable")
+    grids = np.take_along_axis(grids, order, axis=1)
+    scores = np.take_along_axis(scores, order, axis=1)
+    return {
+        "abbreviations": np.asarray(bundle.driver_abbrs)[order],
+        "grid_positions": grids,
+        "scores": scores,
+        "confidence": np.clip(100 - np.abs(scores - grids) * 3, 50, 100),
+        # Every race awards the same points by finishing position
+        "points": np.broadcast_to(points_for_positions(np.arange(1, order.shape[1] + 1)), order.shape),
+    }
+
+
+def predict_races(bundle, requests):
+    """Predict ``[(round, grid), ...]``; returns a ``RacePrediction`` per request.
+
+    Grids are validated first, so one bad grid fails the whole batch before
+    any scoring happens.
+    """
+    try:
+        grid_arrays = [grid_positions(bundle, grid) for _, grid in requests]
+    except GridError:
+        metrics.inc("prediction_errors_total")
+        raise
+    metrics.inc("predictions_total", len(requests))
+    if not requests:
+        return []
+    scores = [prediction_cache.get(rnd, grid, bundle.version) for rnd, grid in requests]
+
+    missing = [i for i, cached in enumerate(scores) if cached is None]
+    if missing:
+        n_drivers = len(bundle.driver_abbrs)
+        with metrics.span("features"):
+            X = build_feature_matrix(
+                bundle.feature_columns,
+                Round=np.array([requests[i][0] for i in missing], dtype=np.float64)[:, None],
+                Abbreviation=bundle.driver_codes,
+                GridPosition=np.stack([grid_arrays[i] for i in missing]),
+                **bundle.driver_stats,
+            )
+        with metrics.span("predict"):
+            predicted = bundle.predict(X).reshape(len(missing), n_drivers)
+        for i, row in zip(missing, predicted):
+            scores[i] = row
+            prediction_cache.put(requests[i][0], requests[i][1], bundle.version, row)
+
+    classified = _classify(bundle, np.stack(grid_arrays), np.stack(scores))
+    return [
+        RacePrediction(rnd, tuple(grid), **{name: values[i] for name, values in classified.items()})
+        for i, (rnd, grid) in enumerate(requests)
+    ]
+
+
+def predict_race(bundle, round_number, grid):
+    return predict_races(bundle, [(round_number, grid)])[0]
@@ -0,0 +1,163 @@
+"""Monte Carlo race simulation on top of the stacking model.
+
+Each simulated race shuffles the grid with Gaussian noise on the grid slots,
+draws retirements from each driver's historical DNF rate in the model's season
+(``Status`` column of the results store) and adds the model's residual noise,
+measured on that model's own training rows, to the predicted score. Samples are scored a chunk at a time: one feature matrix and
+one ``bundle.predict`` call per chunk, never one call per sample.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .features import build_feature_matrix, frame_feature_matrix, position_tier
+from .bundle import TRAINING_DATA_FILE
+from .scoring import points_for_positions
+from .store import load_results
+
+# Statuses that count as reaching the flag; "+1 Lap" style statuses do too
+FINISHED_STATUSES = ("Finished", "Lapped")
+
+# Score added to retired cars so they are classified behind every finisher
+_DNF_PENALTY = 1e6
+
+
+@dataclass
+class SimulationResult:
+    abbrs: list
+    n_sims: int
+    position_counts: np.ndarray  # (drivers, positions) finishing-position histogram
+    dnf_counts: np.ndarray  # (drivers,)
+
+    @property
+    def position_probabilities(self):
+        return self.position_counts / self.n_sims
+
+    def summary(self):
+        """Per-driver probabilities and expectations, ordered by expected finish."""
+        probs = self.position_probabilities
+        positions = np.arange(1, probs.shape[1] + 1)
+        summary = pd.DataFrame({
+            "Abbreviation": self.abbrs,
+            "ExpectedPosition": probs @ positions,
+            "WinProb": probs[:, 0],
+            "PodiumProb": probs[:, :3].sum(axis=1),
+            "PointsProb": probs[:, :10].sum(axis=1),
+            "DNFProb": self.dnf_counts / self.n_sims,
+            "ExpectedPoints": probs @ points_for_positions(positions),
+        })
+        return summary.sort_values("ExpectedPosition").reset_index(drop=True)
+
+
+def dnf_probabilities(abbrs, seasons=None, prior_races=10):
+    """Per-driver retirement probability, shrunk towards the field average.
+
+    ``prior_races`` pseudo-races at the field-wide rate keep rookies with one or
+    two starts from getting a 0% or 50% DNF rate. Before the first race of
+    ``seasons`` is stored, every stored season is used instead.
+    """
+    results = load_results(["Abbreviation", "Status"], seasons=seasons)
+    if not len(results) and seasons is not None:
+        results = load_results(["Abbreviation", "Status"])
+    status = results["Status"].astype("string").fillna("")
+    dnf = ~(status.isin(FINISHED_STATUSES) | status.str.startswith("+"))
+
+    per_driver = dnf.groupby(results["Abbreviation"], observed=True).agg(["sum", "count"]).reindex(abbrs, fill_value=0)
+    base_rate = dnf.mean()
+    return ((per_driver["sum"] + prior_races * base_rate) / (per_driver["count"] + prior_races)).to_numpy()
+
+
+_residual_std = {}
+
+
+def residual_std(bundle, training_path=None):
+    """Standard deviation of the model's in-sample residuals, memoized per model version.
+
+    The training rows are read from the bundle's own artifact directory
+    unless ``training_path`` is given.
+    """
+    if bundle.version not in _residual_std:
+        df = pd.read_csv(training_path or bundle.model_dir / TRAINING_DATA_FILE)
+        df["Abbreviation"] = bundle.encoding.encode(df["Abbreviation"])
+        residuals = position_tier(df["Position"]) - bundle.predict(frame_feature_matrix(df, bundle.feature_columns))
+        _residual_std[bundle.version] = float(residuals.std())
+    return _residual_std[bundle.version]
+
+
+def _ranks(values):
+    """Row-wise 1-based ranks (ties broken by column order)."""
+    ranks = np.empty(values.shape, dtype=np.int64)
+    order = np.argsort(values, axis=1, kind="stable")
+    np.put_along_axis(ranks, order, np.broadcast_to(np.arange(1, values.shape[1] + 1), values.shape), axis=1)
+    return ranks
+
+
+def simulate_race(
+    bundle,
+    round_number,
+    grid,
+    n_sims=10_000,
+    grid_noise=1.0,
+    dnf_probs=None,
+    noise_std=None,
+    chunk_size=2_000,
+    seed=None,
+    season=None,
+):
+    """Simulate ``n_sims`` races for the drivers in ``bundle.drivers``.
+
+    ``grid`` holds each driver's grid position in driver-table order.
+    ``dnf_probs`` and ``noise_std`` default to ``dnf_probabilities`` and
+    ``residual_std``; pass 0 for either (and ``grid_noise=0``) to switch that
+    perturbation off. ``season`` restricts the DNF rates to that season's
+    races (all stored seasons by default).
+    """
+    rng = np.random.default_rng(seed)
+    grid = np.asarray(grid, dtype=np.float64)
+    n_drivers = len(grid)
+    if dnf_probs is None:
+        dnf_probs = dnf_probabilities(bundle.driver_abbrs, seasons=None if season is None else [season])
+    if noise_std is None:
+        noise_std = residual_std(bundle)
+    dnf_probs = np.broadcast_to(np.asarray(dnf_probs, dtype=np.float64), (n_drivers,))
+
+    position_counts = np.zeros((n_drivers, n_drivers), dtype=np.int64)
+    dnf_counts = np.zeros(n_drivers, dtype=np.int64)
+    driver_offsets = np.arange(n_drivers) * n_drivers
+
+    for start in range(0, n_sims, chunk_size):
+        size = min(chunk_size, n_sims - start)
+
+        if grid_noise > 0:
+            grids = _ranks(grid + rng.normal(0.0, grid_noise, (size, n_drivers)))
+        else:
+            grids = np.broadcast_to(grid, (size, n_drivers))
+
+        X = build_feature_matrix(
+            bundle.feature_columns,
+            Round=round_number,
+            Abbreviation=bundle.driver_codes,
+            GridPosition=grids,
+            **bundle.driver_stats,
+        )
+        scores = bundle.predict(X).reshape(size, n_drivers)
+        if noise_std > 0:
+            scores += rng.normal(0.0, noise_std, scores.shape)
+
+        retired = rng.random((size, n_drivers)) < dnf_probs
+        # Retired cars go to the back, in random order among themselves
+        scores = np.where(retired, _DNF_PENALTY + rng.random(scores.shape), scores)
+
+        positions = _ranks(scores)
+        position_counts += np.bincount(
+            (driver_offsets + positions - 1).ravel(), minlength=n_drivers * n_drivers
+        ).reshape(n_drivers, n_drivers)
+        dnf_counts += retired.sum(axis=0)
+
+    return SimulationResult(
+        abbrs=bundle.driver_abbrs,
+        n_sims=n_sims,
+        position_counts=position_counts,
+        dnf_counts=dnf_counts,
+    )
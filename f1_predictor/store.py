@@ -0,0 +1,132 @@
+"""Columnar race results store.
+
+Results are kept as one Parquet file per race, partitioned by season and round
+(``results/Season=2024/Round=5/part-0.parquet``), with categorical
+``Abbreviation``/``TeamId``/``TeamName``/``Status`` columns. ``load_results``
+reads only the requested columns, so a notebook that needs four of the 22
+result columns never parses the others.
+
+A manifest lists the sessions in the store; only sessions recorded there are
+read, so a partially written partition is never picked up.
+"""
+import datetime
+import json
+
+import pandas as pd
+
+from .paths import DATA_DIR
+
+RESULTS_DIR = DATA_DIR / "results"
+MANIFEST_FILE = RESULTS_DIR / "manifest.json"
+LEGACY_RESULTS_FILE = DATA_DIR / "f1_results_2024_2025.csv"
+
+CATEGORICAL_COLUMNS = ["Abbreviation", "TeamId", "TeamName", "Status"]
+STRING_COLUMNS = ["DriverNumber", "ClassifiedPosition"]
+TIMEDELTA_COLUMNS = ["Q1", "Q2", "Q3", "Time"]
+# Stored as hive partition keys, not inside the files
+PARTITION_COLUMNS = ["Season", "Round"]
+
+
+def session_path(season, round_number):
+    return RESULTS_DIR / f"Season={season}" / f"Round={round_number}" / "part-0.parquet"
+
+
+def read_manifest():
+    """``{(season, round): entry}`` for every session in the store."""
+    if not MANIFEST_FILE.exists():
+        return {}
+    entries = json.loads(MANIFEST_FILE.read_text(encoding="utf-8"))["sessions"]
+    return {(entry["season"], entry["round"]): entry for entry in entries}
+
+
+def _write_manifest(manifest):
+    sessions = [manifest[key] for key in sorted(manifest)]
+    tmp_path = MANIFEST_FILE.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps({"sessions": sessions}, indent=2) + "\n", encoding="utf-8")
+    tmp_path.replace(MANIFEST_FILE)
+
+
+def _normalize(results):
+    """Coerce a FastF1 / CSV results frame to the store's column types."""
+    results = results.drop(columns=[c for c in PARTITION_COLUMNS if c in results], errors="ignore").copy()
+    for column in TIMEDELTA_COLUMNS:
+        if column in results:
+            results[column] = pd.to_timedelta(results[column])
+    for column in STRING_COLUMNS:
+        if column in results:
+            results[column] = results[column].astype("string")
+    for column in CATEGORICAL_COLUMNS:
+        if column in results:
+            results[column] = results[column].astype("category")
+    return results
+
+
+def write_sessions(sessions, source="fastf1"):
+    """Write ``{(season, round): results frame}`` and record them in the manifest.
+
+    Each partition is written before the manifest is updated, and the manifest
+    itself is replaced atomically.
+    """
+    manifest = read_manifest()
+    for (season, round_number), results in sessions.items():
+        path = session_path(season, round_number)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".parquet.tmp")
+        _normalize(results).to_parquet(tmp_path, index=False)
+        tmp_path.replace(path)
+
+        manifest[(season, round_number)] = {
+            "season": season,
+            "round": round_number,
+            "rows": len(results),
+            "source": source,
+            "ingested_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    _write_manifest(manifest)
+
+
+def load_results(columns=None, seasons=None, sessions=None):
+    """Read the stored results, projected to ``columns`` (all by default).
+
+    ``seasons`` or an explicit list of ``(season, round)`` ``sessions``
+    restrict which partitions are read. ``Season`` and ``Round`` come from the
+    partition keys and can be requested like any other column.
+    """
+    import pyarrow.dataset as ds
+
+    keys = sorted(read_manifest())
+    if seasons is not None:
+        wanted = set(seasons)
+        keys = [key for key in keys if key[0] in wanted]
+    if sessions is not None:
+        wanted = set(sessions)
+        keys = [key for key in keys if key in wanted]
+    if not keys:
+        return pd.DataFrame(columns=columns)
+
+    dataset = ds.dataset(
+        [str(session_path(season, rnd)) for season, rnd in keys],
+        format="parquet",
+        partitioning=ds.partitioning(flavor="hive"),
+        partition_base_dir=str(RESULTS_DIR),
+    )
+    results = dataset.to_table(columns=columns).to_pandas()
+    for column in PARTITION_COLUMNS:
+        if column in results:
+            results[column] = results[column].astype("int64")
+    return results
+
+
+def import_legacy_csv(path=LEGACY_RESULTS_FILE, first_season=2024):
+    """Seed the store from the wide ``f1_results_2024_2025.csv``.
+
+    That file has no season column; seasons are inferred from row order, a new
+    season starting whenever the round number goes down.
+    """
+    results = pd.read_csv(path)
+    season = first_season + (results["Round"].diff() < 0).cumsum()
+    write_sessions(
+        {(int(s), int(r)): group for (s, r), group in results.groupby([season, results["Round"]])},
+        source=path.name if hasattr(path, "name") else str(path),
+    )
@@ -0,0 +1,265 @@
+"""Model training script, a faster replacement for the search in ``train_model.ipynb``.
+
+The notebook grid-searches 243 GradientBoosting configurations x 5 folds and
+then lets the StackingRegressor cross-validate every base model again on its
+own folds. This script:
+
+* searches the GBR with successive halving (default) or a randomized search,
+  with early stopping on ``n_estimators`` (``n_iter_no_change``);
+* computes the K-fold splits once and reuses them for the search and for the
+  stacking stage;
+* runs everything with a configurable worker budget.
+
+    python -m f1_predictor.training --search halving --workers 4
+    python -m f1_predictor.training --search grid     # the notebook's original grid
+    python -m f1_predictor.training --publish 2025 --season 2025
+
+Artifacts go to a fresh directory (``model/<timestamp>`` by default), never
+into one the registry serves: a running server reads those files lazily, so
+rewriting them in place could pair a new model with an old scaler. The new
+directory also gets the training rows, the base model's driver table and team
+colours, and ``--publish`` registers it, which swaps it in atomically
+(``registry.py``).
+"""
+import argparse
+import os
+import shutil
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.stats import loguniform, randint
+from sklearn.ensemble import GradientBoostingRegressor, StackingRegressor
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.linear_model import Lasso, Ridge
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import GridSearchCV, HalvingRandomSearchCV, KFold, RandomizedSearchCV, train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from xgboost import XGBRegressor
+
+from .bundle import (
+    DRIVERS_FILE, ENCODER_FILE, FEATURE_COLUMNS_FILE, MODEL_FILE, SCALER_FILE, TEAM_COLORS_FILE, TRAINING_DATA_FILE,
+)
+from .compiled import COMPILED_FILE, export_compiled, source_version
+from .features import FEATURE_COLUMNS, frame_feature_matrix, position_tier
+from .paths import MODEL_DIR
+from .registry import ModelEntry, publish, read_registry
+
+TRAINING_FILE = MODEL_DIR / TRAINING_DATA_FILE
+
+# The notebook's GridSearchCV grid
+GBR_PARAM_GRID = {
+    "n_estimators": [100, 200, 300],
+    "learning_rate": [0.01, 0.05, 0.1],
+    "max_depth": [3, 4, 5],
+    "min_samples_split": [2, 5, 7],
+    "min_samples_leaf": [1, 3, 5],
+}
+
+# Sampled by the halving/randomized searches; n_estimators is left to early stopping
+GBR_PARAM_DISTRIBUTIONS = {
+    "learning_rate": loguniform(0.01, 0.2),
+    "max_depth": randint(2, 6),
+    "min_samples_split": randint(2, 8),
+    "min_samples_leaf": randint(1, 6),
+    "subsample": [0.8, 1.0],
+}
+
+# Upper bound for n_estimators when early stopping decides the actual count
+MAX_ESTIMATORS = 500
+
+# Smallest training subset successive halving starts from; keeps every test
+# fold large enough for a meaningful R2 on this ~400-row dataset
+MIN_HALVING_SAMPLES = 100
+
+
+def load_training_data(path=TRAINING_FILE):
+    """Feature matrix, PositionTier target and fitted driver encoder."""
+    df = pd.read_csv(path)
+    encoder = LabelEncoder()
+    df["Abbreviation"] = encoder.fit_transform(df["Abbreviation"])
+    X = frame_feature_matrix(df, FEATURE_COLUMNS)
+    y = position_tier(df["Position"])
+    return X, y, encoder
+
+
+def make_search(search, folds, workers, n_iter, random_state):
+    if search == "grid":
+        return GridSearchCV(
+            GradientBoostingRegressor(random_state=random_state),
+            GBR_PARAM_GRID,
+            cv=folds,
+            scoring="r2",
+            n_jobs=workers,
+        )
+
+    early_stopped = GradientBoostingRegressor(
+        n_estimators=MAX_ESTIMATORS,
+        n_iter_no_change=10,
+        validation_fraction=0.1,
+        random_state=random_state,
+    )
+    if search == "halving":
+        return HalvingRandomSearchCV(
+            early_stopped,
+            GBR_PARAM_DISTRIBUTIONS,
+            n_candidates=n_iter,
+            factor=3,
+            min_resources=MIN_HALVING_SAMPLES,
+            cv=folds,
+            scoring="r2",
+            n_jobs=workers,
+            random_state=random_state,
+        )
+    return RandomizedSearchCV(
+        early_stopped,
+        GBR_PARAM_DISTRIBUTIONS,
+        n_iter=n_iter,
+        cv=folds,
+        scoring="r2",
+        n_jobs=workers,
+        random_state=random_state,
+    )
+
+
+def make_stack(best_gbr, folds, workers):
+    estimators = [
+        ("ridge", Ridge(alpha=1.0)),
+        ("lasso", Lasso(alpha=0.01)),
+        ("xgb", XGBRegressor(n_estimators=200, verbosity=0, n_jobs=1)),
+        ("gbr", best_gbr),
+    ]
+    return StackingRegressor(estimators=estimators, final_estimator=Ridge(), cv=folds, n_jobs=workers)
+
+
+def train(search="halving", workers=1, n_splits=5, n_iter=60, random_state=42):
+    """Fit scaler, tuned GBR and the stacking model. Returns ``(artifacts, report)``."""
+    X, y, encoder = load_training_data()
+
+    # Scaled on the full data, as in the notebook
+    scaler = StandardScaler().fit(X)
+    X_scaled = scaler.transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, test_size=0.2, random_state=random_state)
+
+    # One set of folds for both the GBR search and the stacking stage
+    folds = list(KFold(n_splits=n_splits, shuffle=True, random_state=random_state).split(X_train))
+
+    start = time.perf_counter()
+    searcher = make_search(search, folds, workers, n_iter, random_state).fit(X_train, y_train)
+    search_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stack = make_stack(searcher.best_estimator_, folds, workers).fit(X_train, y_train)
+    stack_seconds = time.perf_counter() - start
+
+    y_pred = stack.predict(X_test)
+    report = {
+        "search": search,
+        "best_params": {name: getattr(value, "item", lambda: value)() for name, value in searcher.best_params_.items()},
+        "best_gbr_estimators": int(searcher.best_estimator_.n_estimators_),
+        "search_cv_r2": float(searcher.best_score_),
+        "search_seconds": search_seconds,
+        "stack_seconds": stack_seconds,
+        "r2": r2_score(y_test, y_pred),
+        "mae": mean_absolute_error(y_test, y_pred),
+        "rmse": float(np.sqrt(mean_squared_error(y_test, y_pred))),
+    }
+    artifacts = {
+        MODEL_FILE: stack,
+        SCALER_FILE: scaler,
+        FEATURE_COLUMNS_FILE: list(FEATURE_COLUMNS),
+        ENCODER_FILE: encoder,
+    }
+    return artifacts, report
+
+
+def check_unregistered(out_dir):
+    """Refuse to write into a directory a registered model is served from."""
+    for entry in read_registry().entries.values():
+        if entry.model_dir() == Path(out_dir).resolve():
+            raise ValueError(
+                f"{out_dir} is served as model {entry.id!r}; write to a fresh directory and publish it instead"
+            )
+
+
+def save_artifacts(artifacts, out_dir, base_dir=MODEL_DIR):
+    """Write the artifacts to a new directory and re-export the compiled predictor.
+
+    The training rows and ``base_dir``'s driver table and team colours are
+    copied alongside, so the directory is a complete artifact set.
+    """
+    check_unregistered(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / TRAINING_DATA_FILE).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(TRAINING_FILE, out_dir / TRAINING_DATA_FILE)
+    for name in (DRIVERS_FILE, TEAM_COLORS_FILE):
+        if (base_dir / name).exists():
+            shutil.copyfile(base_dir / name, out_dir / name)
+
+    for name in sorted(artifacts, key=lambda name: name == MODEL_FILE):
+        tmp_path = out_dir / (name + ".tmp")
+        joblib.dump(artifacts[name], tmp_path)
+        tmp_path.replace(out_dir / name)
+
+    compiled = export_compiled(
+        artifacts[MODEL_FILE],
+        artifacts[SCALER_FILE],
+        version=source_version(out_dir),
+        encoder=artifacts[ENCODER_FILE],
+    )
+    compiled.save(out_dir / COMPILED_FILE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the stacking race predictor.")
+    parser.add_argument("--search", choices=["halving", "random", "grid"], default="halving")
+    parser.add_argument("--workers", type=int, default=1, help="parallel jobs for search and stacking (-1 = all CPUs)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--n-iter", type=int, default=60, help="candidates for halving/random search")
+    parser.add_argument("--out-dir", type=Path, help="new artifact directory (default: model/<timestamp>)")
+    parser.add_argument("--base-model", help="registered model whose driver table and team colours are copied")
+    parser.add_argument("--publish", metavar="ID", help="register the new directory under this model id")
+    parser.add_argument("--season", type=int, help="season of the published model (default: the base model's)")
+    parser.add_argument("--default", action="store_true", help="make the published model the default")
+    parser.add_argument("--dry-run", action="store_true", help="train and report without writing artifacts")
+    args = parser.parse_args()
+
+    base = read_registry().get(args.base_model)
+    out_dir = (args.out_dir or MODEL_DIR / time.strftime("%Y%m%d-%H%M%S")).resolve()
+    if not args.dry_run:
+        try:
+            # Fail before the search, not after it
+            check_unregistered(out_dir)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    artifacts, report = train(args.search, args.workers, args.folds, args.n_iter)
+    print(f"Search ({report['search']}): {report['search_seconds']:.1f}s, CV R2 {report['search_cv_r2']:.4f}")
+    print(f"Best GBR: {report['best_params']} ({report['best_gbr_estimators']} trees after early stopping)")
+    print(f"Stacking: {report['stack_seconds']:.1f}s")
+    print(f"Stacking R2 Score: {report['r2']:.4f}")
+    print(f"MAE: {report['mae']:.2f}")
+    print(f"RMSE: {report['rmse']:.2f}")
+
+    if args.dry_run:
+        return
+    save_artifacts(artifacts, out_dir, base.model_dir())
+    print(f"Saved artifacts to {out_dir}")
+
+    if args.publish:
+        season = args.season or base.season
+        entry = ModelEntry(
+            id=args.publish,
+            season=season,
+            title=f"F1 Race Predictor {season}",
+            label=base.label,
+            path=os.path.relpath(out_dir, MODEL_DIR),
+        )
+        publish(entry, make_default=args.default)
+        print(f"Published {entry.id} -> {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
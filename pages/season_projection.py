@@ -0,0 +1,86 @@
+import pandas as pd
+import streamlit as st
+
+from f1_predictor.registry import get_bundle, read_registry
+from f1_predictor.schedule import get_schedule
+from f1_predictor.season import SeasonStandings, iter_season, load_grids
+
+# Rounds scored per predict call; small enough that the first rounds show up quickly
+CHUNK_ROUNDS = 4
+
+st.set_page_config(page_title="F1 Season Projection", page_icon="🏆", layout="wide")
+st.title("🏆 Season Projection")
+st.caption("Predict every round of the calendar and accumulate the championship standings.")
+
+registry = read_registry()
+season_col, model_col = st.columns(2)
+with season_col:
+    season = st.selectbox("Season", registry.seasons())
+with model_col:
+    entry = st.selectbox("Model", registry.for_season(season), format_func=lambda item: item.label)
+_, bundle = get_bundle(entry.id)
+
+try:
+    schedule = get_schedule(season)
+except FileNotFoundError as exc:
+    st.error(f"⚠️ {exc}")
+    st.stop()
+
+grid_file = st.file_uploader(
+    "Grids CSV (Round, Abbreviation, GridPosition)",
+    type="csv",
+    help=(
+        "Rounds missing from the file use the average qualifying grid. Drivers missing from "
+        "a listed round fill its free slots in average qualifying order."
+    ),
+)
+
+if st.button("🏁 PROJECT SEASON", use_container_width=True):
+    try:
+        grids = load_grids(grid_file, bundle, schedule.event_rounds) if grid_file else None
+    except ValueError as exc:
+        st.error(f"⚠️ {exc}")
+        st.stop()
+    standings = SeasonStandings(bundle.drivers)
+    round_results = []
+
+    progress = st.progress(0.0)
+    driver_col, team_col = st.columns([3, 2])
+    with driver_col:
+        st.subheader("Drivers")
+        driver_table = st.empty()
+    with team_col:
+        st.subheader("Constructors")
+        team_table = st.empty()
+    st.subheader("Rounds")
+    rounds_box = st.container()
+
+    for prediction in iter_season(bundle, schedule, grids, chunk_rounds=CHUNK_ROUNDS):
+        standings.add(prediction)
+        round_results.append(prediction.results)
+
+        progress.progress(
+            standings.rounds / len(schedule.event_rounds),
+            text=f"Round {prediction.round_number}: {prediction.event_name}",
+        )
+        driver_table.dataframe(standings.drivers(), use_container_width=True)
+        team_table.dataframe(standings.constructors(), use_container_width=True)
+        with rounds_box.expander(f"R{prediction.round_number} · {prediction.event_name}"):
+            st.dataframe(prediction.results, hide_index=True, use_container_width=True)
+
+    download_cols = st.columns(3)
+    download_cols[0].download_button(
+        "⬇️ Round results (CSV)",
+        pd.concat(round_results, ignore_index=True).to_csv(index=False),
+        file_name=f"f1_{season}_round_predictions.csv",
+    )
+    download_cols[1].download_button(
+        "⬇️ Driver standings (CSV)",
+        standings.drivers().to_csv(index=False),
+        file_name=f"f1_{season}_driver_standings.csv",
+    )
+    download_cols[2].download_button(
+        "⬇️ Constructor standings (CSV)",
+        standings.constructors().to_csv(index=False),
+        file_name=f"f1_{season}_constructor_standings.csv",
+    )
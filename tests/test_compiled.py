@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from f1_predictor.bundle import load_bundle
+from f1_predictor.compiled import CompiledPredictor, _unique_rows, export_compiled, verification_inputs, verify
+
+
+@pytest.fixture(scope="module")
+def bundle():
+    return load_bundle()
+
+
+@pytest.fixture(scope="module")
+def inputs(bundle):
+    return verification_inputs(bundle, n_grids=2_000)
+
+
+def test_saved_predictor_is_current(bundle):
+    assert bundle.compiled is not None
+
+
+@pytest.mark.parametrize("name", ["training rows", "grids, one round", "grids, all rounds"])
+def test_saved_predictor_matches_stacking_model(bundle, inputs, name):
+    verify(bundle.compiled, bundle.model, bundle.scaler, inputs[name])
+
+
+def test_export_matches_stacking_model(bundle, inputs, tmp_path):
+    compiled = export_compiled(bundle.model, bundle.scaler)
+    compiled.save(tmp_path / "compiled.npz")
+    reloaded = CompiledPredictor.load(tmp_path / "compiled.npz")
+    verify(reloaded, bundle.model, bundle.scaler, inputs["grids, all rounds"])
+
+
+def test_unique_rows():
+    X = np.array([[1.0, 2.0], [3.0, 4.0], [1.0, 2.0], [-0.0, 0.0]])
+    first, inverse = _unique_rows(X)
+    assert len(first) == 4 - 1
+    np.testing.assert_array_equal(X[first][inverse], X)
@@ -0,0 +1,25 @@
+import pandas as pd
+import pytest
+
+from f1_predictor import ingest
+
+
+def fake_results(season, round_number, cache_dir):
+    if round_number == 2:
+        raise ConnectionError("timed out")
+    return pd.DataFrame({"Abbreviation": ["VER"], "Position": [1.0]})
+
+
+def test_failed_session_does_not_discard_the_others(monkeypatch, tmp_path):
+    written = {}
+    monkeypatch.setattr(ingest, "_load_session_results", fake_results)
+    monkeypatch.setattr(ingest, "read_manifest", dict)
+    monkeypatch.setattr(ingest, "write_sessions", written.update)
+
+    with pytest.raises(ingest.IngestError) as info:
+        ingest.ingest([(2025, 1), (2025, 2), (2025, 3)], workers=2, cache_dir=tmp_path)
+
+    assert sorted(written) == [(2025, 1), (2025, 3)]
+    assert info.value.ingested == [(2025, 1), (2025, 3)]
+    assert list(info.value.failures) == [(2025, 2)]
+    assert "2025 R2" in str(info.value)
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from f1_predictor.pace import PACE_COLUMNS, session_pace
+
+
+def race_laps(drivers=("VER", "NOR"), laps=20):
+    """Synthetic green-flag race: one stint per driver, 0.05 s/lap degradation."""
+    rows = []
+    for offset, driver in enumerate(drivers):
+        for lap in range(1, laps + 1):
+            rows.append({
+                "Driver": driver,
+                "LapNumber": lap,
+                "LapTime": pd.Timedelta(seconds=90 + offset + 0.05 * lap - 0.03 * (lap - 1)),
+                "Stint": 1,
+                "TyreLife": lap,
+                "PitInTime": pd.NaT,
+                "PitOutTime": pd.NaT,
+                "TrackStatus": "1",
+                "IsAccurate": True,
+            })
+    return pd.DataFrame(rows)
+
+
+def test_session_pace():
+    pace = session_pace(race_laps()).set_index("Abbreviation")
+    assert list(pace.columns) == PACE_COLUMNS
+    assert pace.loc["VER", "LongRunDelta"] == 0
+    assert pace.loc["NOR", "LongRunDelta"] > 0
+    np.testing.assert_allclose(pace["TyreDegradation"], 0.05)
+    assert (pace["CleanLaps"] == 19).all()
+
+
+def test_session_without_clean_laps():
+    pace = session_pace(race_laps().assign(TrackStatus="4")).set_index("Abbreviation")
+    assert list(pace.index) == ["VER", "NOR"]
+    assert pace[PACE_COLUMNS[:-1]].isna().all().all()
+    assert (pace["CleanLaps"] == 0).all()
+
+
+def test_session_without_laps():
+    pace = session_pace(race_laps().iloc[:0])
+    assert list(pace.columns) == ["Abbreviation", *PACE_COLUMNS]
+    assert pace.empty
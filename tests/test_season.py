@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from f1_predictor.bundle import load_bundle
+from f1_predictor.season import average_quali_grid, load_grids
+
+
+@pytest.fixture(scope="module")
+def bundle():
+    return load_bundle()
+
+
+def write_grids(path, rows):
+    pd.DataFrame(rows, columns=["Round", "Abbreviation", "GridPosition"]).to_csv(path, index=False)
+    return path
+
+
+def test_partial_round_keeps_listed_positions_and_stays_a_permutation(bundle, tmp_path):
+    base = average_quali_grid(bundle)
+    order = [bundle.driver_abbrs[i] for i in np.argsort(base, kind="stable")]
+    # Swap the average-qualifying front row and leave everyone else out
+    path = write_grids(tmp_path / "grids.csv", [(2, order[1], 1), (2, order[0], 2), (2, order[-1], 3)])
+
+    grids = load_grids(path, bundle, [1, 2])
+    positions = dict(zip(bundle.driver_abbrs, grids[1]))
+
+    assert np.array_equal(grids[0], base)
+    assert sorted(grids[1]) == list(range(1, len(base) + 1))
+    assert [positions[order[1]], positions[order[0]], positions[order[-1]]] == [1, 2, 3]
+    assert positions[order[2]] == 4
+
+
+def test_repeated_position_is_rejected(bundle, tmp_path):
+    path = write_grids(tmp_path / "grids.csv", [(1, bundle.driver_abbrs[0], 1), (1, bundle.driver_abbrs[1], 1)])
+
+    with pytest.raises(ValueError, match="Round 1"):
+        load_grids(path, bundle, [1])